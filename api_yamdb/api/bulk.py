@@ -0,0 +1,129 @@
+"""Массовое создание и обновление произведений.
+
+Каждый элемент проверяется отдельно, и ошибка элемента не прерывает
+пачку. Жанры, категории и существующие произведения всей пачки
+выбираются тремя запросами с IN и передаются сериализаторам элементов
+через context['slug_objects'], а запись идёт через bulk_create и
+bulk_update в одной транзакции. bulk-операции не отправляют сигналы,
+поэтому search_name, кэш и индекс автодополнения обновляются здесь.
+"""
+from django.db import transaction
+from reviews.autocomplete import autocomplete_index
+from reviews.models import Category, Genre, Title
+from reviews.search import normalize_search_key
+from reviews.versions import bump_version
+
+from .serializers import TitleBulkItemSerializer, resolve_slugs
+
+TitleGenre = Title.genre.through
+UPDATE_FIELDS = ('name', 'year', 'description', 'category', 'search_name')
+
+
+def item_slugs(items, name):
+    """Все строковые слаги поля name во входных элементах, до их
+    проверки сериализатором."""
+    slugs = set()
+    for item in items:
+        value = item.get(name) if isinstance(item, dict) else None
+        values = value if isinstance(value, list) else [value]
+        slugs.update(slug for slug in values if isinstance(slug, str))
+    return slugs
+
+
+def build_title(data):
+    return Title(
+        id=data.get('id'),
+        name=data['name'],
+        year=data['year'],
+        description=data.get('description', ''),
+        category=data['category'],
+        search_name=normalize_search_key(data['name']),
+    )
+
+
+def titles_changed(title_ids):
+    for title_id in title_ids:
+        bump_version('title', title_id)
+    bump_version('titles', 'list')
+    autocomplete_index.invalidate()
+
+
+def check_ids(valid, results):
+    """Убирает из valid элементы с несуществующим id и повторы id в
+    пачке: повтор получает ошибку, сохраняется первый элемент."""
+    title_ids = set(Title.objects.filter(
+        id__in={data['id'] for data in valid.values() if 'id' in data}
+    ).values_list('id', flat=True))
+    seen = set()
+    for index, data in list(valid.items()):
+        if 'id' not in data:
+            continue
+        if data['id'] not in title_ids:
+            results[index] = {'errors': {'id': ['Произведение не найдено.']}}
+            del valid[index]
+        elif data['id'] in seen:
+            results[index] = {'errors': {'id': [
+                'Произведение уже есть в этой пачке.'
+            ]}}
+            del valid[index]
+        seen.add(data['id'])
+
+
+def save_titles(items):
+    """Создаёт элементы без id и заменяет произведения с id. Возвращает
+    по результату на элемент в том же порядке: {'id', 'status'} или
+    {'errors'}."""
+    results = [None] * len(items)
+    context = {'slug_objects': {
+        Genre: resolve_slugs(
+            Genre.objects.all(), 'slug', item_slugs(items, 'genre')
+        ),
+        Category: resolve_slugs(
+            Category.objects.all(), 'slug', item_slugs(items, 'category')
+        ),
+    }}
+    valid = {}
+    for index, item in enumerate(items):
+        serializer = TitleBulkItemSerializer(data=item, context=context)
+        if serializer.is_valid():
+            valid[index] = serializer.validated_data
+        else:
+            results[index] = {'errors': serializer.errors}
+
+    check_ids(valid, results)
+
+    created = {
+        index: build_title(data)
+        for index, data in valid.items() if 'id' not in data
+    }
+    updated = {
+        index: build_title(data)
+        for index, data in valid.items() if 'id' in data
+    }
+    with transaction.atomic():
+        new_titles = Title.objects.bulk_create(created.values())
+        if new_titles and new_titles[0].pk is None:
+            # SQLite в Django 3.2 не возвращает id из bulk_create. Запись
+            # в SQLite идёт под блокировкой до конца транзакции, поэтому
+            # новые произведения — последние len(new_titles) строк.
+            ids = Title.objects.order_by('-id').values_list(
+                'id', flat=True
+            )[:len(new_titles)]
+            for title, title_id in zip(new_titles, reversed(list(ids))):
+                title.pk = title_id
+        Title.objects.bulk_update(updated.values(), UPDATE_FIELDS)
+        TitleGenre.objects.filter(
+            title_id__in=[title.pk for title in updated.values()]
+        ).delete()
+        TitleGenre.objects.bulk_create(
+            TitleGenre(title_id=title.pk, genre_id=genre.pk)
+            for index, title in (*created.items(), *updated.items())
+            for genre in valid[index]['genre']
+        )
+        changed = [title.pk for title in (*new_titles, *updated.values())]
+        transaction.on_commit(lambda: titles_changed(changed))
+
+    for status, titles in (('created', created), ('updated', updated)):
+        for index, title in titles.items():
+            results[index] = {'id': title.pk, 'status': status}
+    return results
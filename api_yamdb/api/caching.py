@@ -0,0 +1,309 @@
+"""Кэш отрендеренных ответов API.
+
+Ответ кэшируется байтами после рендера, поэтому попадание в кэш не
+выполняет ни запросов к БД, ни сериализации. Ключ содержит версию
+данных из reviews.versions, которую сигналы увеличивают при записи.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Max
+from django.http import HttpRequest, HttpResponse
+from django.utils.http import http_date, parse_etags, urlencode
+from rest_framework import status
+from rest_framework.response import Response
+from reviews.versions import get_version, get_versions
+
+
+def render_response(view, response):
+    """Рендерит ответ DRF внутри вьюсета, чтобы сохранить его байты."""
+    response = view.finalize_response(view.request, response)
+    return response.render()
+
+
+def response_cache_key(prefix, request, version):
+    url = md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'response:{prefix}:{version}:{url}'
+
+
+def cached_content(key):
+    cached = cache.get(key)
+    if cached is None:
+        return None
+    content, content_type = cached
+    return HttpResponse(content, content_type=content_type)
+
+
+def cache_content(key, response, timeout):
+    cache.set(
+        key, (response.content, response['Content-Type']), timeout
+    )
+
+
+refresh_executor = ThreadPoolExecutor(
+    max_workers=settings.RESPONSE_REFRESH_WORKERS,
+    thread_name_prefix='response-refresh',
+)
+
+
+def run_in_background(func):
+    """Ставит фоновое обновление кэша в общий пул из
+    RESPONSE_REFRESH_WORKERS потоков. Задача закрывает свои
+    подключения к БД по завершении."""
+    def run():
+        try:
+            func()
+        finally:
+            connections.close_all()
+    refresh_executor.submit(run)
+
+
+class DetachedRequest(HttpRequest):
+    """Копия GET-запроса для фонового потока: путь, параметры и
+    заголовки (в том числе Authorization) исходного запроса, но свой
+    объект. Аутентификация DRF в потоке пишет user в копию, а не в
+    запрос, который основной поток ещё обрабатывает."""
+
+    def __init__(self, request):
+        super().__init__()
+        self.method = 'GET'
+        self.path = request.path
+        self.path_info = request.path_info
+        self.GET = request.GET.copy()
+        self.META = {
+            key: value for key, value in request.META.items()
+            if isinstance(value, str)
+        }
+        self.scheme_name = request.scheme
+
+    def _get_scheme(self):
+        return self.scheme_name
+
+
+def get_or_render(key, build, timeout):
+    """Ответ из кэша или build() с сохранением в кэш.
+
+    Одновременные промахи по одному ключу объединяются: строит ответ
+    только процесс, взявший блокировку cache.add(), остальные ждут его
+    результат не дольше RESPONSE_CACHE_LOCK_TIMEOUT секунд, а потом
+    строят ответ сами.
+    """
+    response = cached_content(key)
+    if response is not None:
+        return response
+    lock_key = f'{key}:lock'
+    lock_timeout = settings.RESPONSE_CACHE_LOCK_TIMEOUT
+    deadline = time.monotonic() + lock_timeout
+    while not cache.add(lock_key, 1, lock_timeout):
+        if time.monotonic() >= deadline:
+            return build()
+        time.sleep(settings.RESPONSE_CACHE_LOCK_POLL)
+        response = cached_content(key)
+        if response is not None:
+            return response
+    try:
+        response = build()
+        if response.status_code == status.HTTP_200_OK:
+            cache_content(key, response, timeout)
+        return response
+    finally:
+        cache.delete(lock_key)
+
+
+class CachedListMixin:
+    """Кэширует JSON-ответы list() по полному URL (с ?search=, limit и
+    offset) под версией (basename, 'list'). Браузерный API не
+    кэшируется."""
+
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != 'json':
+            return super().list(request, *args, **kwargs)
+        key = response_cache_key(
+            self.basename, request, get_version(self.basename, 'list')
+        )
+        return get_or_render(
+            key,
+            lambda: render_response(
+                self, super(CachedListMixin, self).list(
+                    request, *args, **kwargs
+                )
+            ),
+            settings.LIST_CACHE_TIMEOUT,
+        )
+
+
+class ConditionalGetMixin:
+    """ETag и If-None-Match для list() и retrieve().
+
+    ETag строится из счётчиков версий get_etag_versions(), а не из тела
+    ответа, поэтому при совпадении 304 отдаётся до основного запроса и
+    сериализации. Last-Modified — самая поздняя дата поля
+    last_modified_field среди отдаваемых записей. If-Modified-Since не
+    проверяется: дата публикации не меняется при правке и удалении.
+    """
+
+    conditional_actions = ('list', 'retrieve')
+    last_modified_field = None
+
+    def get_etag_versions(self):
+        raise NotImplementedError
+
+    def get_etag(self, request):
+        if getattr(self, '_etag', None) is None:
+            versions = get_versions(*self.get_etag_versions())
+            parts = [
+                self.basename, request.accepted_renderer.format, *versions
+            ]
+            self._etag = '"{}"'.format('-'.join(str(p) for p in parts))
+        return self._etag
+
+    def get_last_modified(self):
+        queryset = self.get_queryset()
+        if self.action == 'retrieve':
+            queryset = queryset.filter(pk=self.kwargs[self.lookup_field])
+        return queryset.aggregate(
+            last_modified=Max(self.last_modified_field)
+        )['last_modified']
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.conditional_actions:
+            return handler(request, *args, **kwargs)
+        etag = self.get_etag(request)
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag}
+            )
+        response = handler(request, *args, **kwargs)
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        response['ETag'] = etag
+        if self.last_modified_field is not None:
+            last_modified = self.get_last_modified()
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(
+                    last_modified.timestamp()
+                )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class CachedRetrieveMixin:
+    """Кэширует отрендеренный JSON retrieve() под ETag из
+    ConditionalGetMixin: любая запись, меняющая ETag, меняет и ключ."""
+
+    def retrieve(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != 'json':
+            return super().retrieve(request, *args, **kwargs)
+        key = response_cache_key(
+            self.basename, request, self.get_etag(request).strip('"')
+        )
+        return get_or_render(
+            key,
+            lambda: render_response(
+                self, super(CachedRetrieveMixin, self).retrieve(
+                    request, *args, **kwargs
+                )
+            ),
+            settings.DETAIL_CACHE_TIMEOUT,
+        )
+
+
+class StaleListMixin:
+    """Кэш страниц list() с stale-while-revalidate.
+
+    Ключ — нормализованные параметры фильтров filterset_class,
+    пагинации и ?fields=/?omit=: пустые значения отброшены, остальные
+    отсортированы.
+    Вместе с ответом хранится версия (basename, 'list'), с которой он
+    построен, и время построения. Если версия устарела, но ответ
+    построен не раньше чем LIST_MAX_STALE секунд назад, отдаётся
+    устаревший ответ, а один фоновый поток строит свежий. Более старый
+    ответ строится заново в запросе.
+    """
+
+    list_cache_params = (
+        'limit', 'offset', 'cursor', 'pagination', 'count', 'fields', 'omit',
+    )
+    list_refresh = False
+
+    def get_list_cache_key(self, request):
+        names = set(self.filterset_class.base_filters).union(
+            self.list_cache_params
+        )
+        params = sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            if name in names
+            for value in values
+            if value.strip()
+        )
+        url = md5('{}?{}'.format(
+            request.build_absolute_uri(request.path), urlencode(params)
+        ).encode()).hexdigest()
+        return f'response:{self.basename}:{self.action}:{url}'
+
+    def store_list_page(self, key, response, version):
+        cache.set(
+            key,
+            (response.content, response['Content-Type'], version, time.time()),
+            settings.LIST_CACHE_TIMEOUT,
+        )
+
+    def refresh_list_page(self, request, key):
+        """Строит страницу заново в фоне через новый экземпляр вьюсета,
+        если её ещё не обновляет другой запрос."""
+        lock_key = f'{key}:refresh'
+        if not cache.add(lock_key, 1, settings.RESPONSE_CACHE_LOCK_TIMEOUT):
+            return
+        view = type(self).as_view(
+            {'get': self.action},
+            basename=self.basename,
+            detail=self.detail,
+            list_refresh=True,
+        )
+        detached = DetachedRequest(request._request)
+
+        def refresh():
+            try:
+                version = get_version(self.basename, 'list')
+                response = view(detached, *self.args, **self.kwargs)
+                response.render()
+                if response.status_code == status.HTTP_200_OK:
+                    self.store_list_page(key, response, version)
+            finally:
+                cache.delete(lock_key)
+
+        run_in_background(refresh)
+
+    def list(self, request, *args, **kwargs):
+        if self.list_refresh or request.accepted_renderer.format != 'json':
+            return super().list(request, *args, **kwargs)
+        key = self.get_list_cache_key(request)
+        version = get_version(self.basename, 'list')
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type, cached_version, built_at = cached
+            if cached_version == version:
+                return HttpResponse(content, content_type=content_type)
+            if time.time() - built_at <= settings.LIST_MAX_STALE:
+                self.refresh_list_page(request, key)
+                return HttpResponse(content, content_type=content_type)
+        response = render_response(
+            self, super().list(request, *args, **kwargs)
+        )
+        if response.status_code == status.HTTP_200_OK:
+            self.store_list_page(key, response, version)
+        return response
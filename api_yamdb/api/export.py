@@ -0,0 +1,61 @@
+"""Потоковая выгрузка каталога и отзывов.
+
+Строки читаются из БД через iterator(chunk_size=EXPORT_CHUNK_SIZE) и
+сразу отдаются клиенту, поэтому память не зависит от размера таблиц.
+Жанры и категории произведений выбираются одним запросом на пачку
+строк (см. api.readers.TitleReader), а не на каждое произведение.
+"""
+import csv
+import json
+from itertools import islice
+
+from django.conf import settings
+from reviews.models import Review, Title
+
+from .readers import TitleReader, pub_date_field
+
+REVIEW_COLUMNS = ('id', 'title_id', 'author', 'score', 'text', 'pub_date')
+
+
+def chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def titles_ndjson():
+    """Произведения в формате NDJSON: по объекту JSON, как в
+    /api/v1/titles/, на строку."""
+    size = settings.EXPORT_CHUNK_SIZE
+    reader = TitleReader()
+    rows = reader.values(Title.objects.order_by('id')).iterator(
+        chunk_size=size
+    )
+    for chunk in chunks(rows, size):
+        yield ''.join(
+            json.dumps(title, ensure_ascii=False) + '\n'
+            for title in reader.serialize(chunk)
+        )
+
+
+class Echo:
+    """Файл для csv.writer, который возвращает записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def reviews_csv():
+    """Отзывы в формате CSV с заголовком REVIEW_COLUMNS."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(REVIEW_COLUMNS)
+    rows = Review.objects.order_by('id').values_list(
+        'id', 'title_id', 'author__username', 'score', 'text', 'pub_date'
+    ).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    for *values, pub_date in rows:
+        yield writer.writerow(
+            [*values, pub_date_field.to_representation(pub_date)]
+        )
@@ -1,6 +1,19 @@
 from django_filters import rest_framework as filters
+from rest_framework.filters import BaseFilterBackend
 
 from reviews.models import Title
+from reviews.search import filter_name_prefix, search_titles
+
+
+class NamePrefixFilter(BaseFilterBackend):
+    """?name_prefix= ищет по началу названия без учёта регистра и ё
+    через индекс search_name."""
+
+    def filter_queryset(self, request, queryset, view):
+        value = request.query_params.get('name_prefix', '')
+        if not value.strip():
+            return queryset
+        return filter_name_prefix(queryset, value)
 
 
 class FilterTitle(filters.FilterSet):
@@ -8,6 +21,8 @@ class FilterTitle(filters.FilterSet):
         field_name='name',
         lookup_expr='contains'
     )
+    name_prefix = filters.CharFilter(method='filter_name_prefix')
+    q = filters.CharFilter(method='filter_search')
     genre = filters.CharFilter(
         field_name='genre__slug',
         lookup_expr='exact'
@@ -16,7 +31,55 @@ class FilterTitle(filters.FilterSet):
         field_name='category__slug',
         lookup_expr='exact'
     )
+    year_min = filters.NumberFilter(
+        field_name='year',
+        lookup_expr='gte'
+    )
+    year_max = filters.NumberFilter(
+        field_name='year',
+        lookup_expr='lte'
+    )
+    rating_min = filters.NumberFilter(
+        field_name='rating',
+        lookup_expr='gte'
+    )
+    rating_max = filters.NumberFilter(
+        field_name='rating',
+        lookup_expr='lte'
+    )
+    # Для каждого поля сортировки есть индекс в Title.Meta.indexes.
+    ordering = filters.OrderingFilter(
+        fields=('rating', 'year', 'review_count', 'name',)
+    )
 
     class Meta:
         model = Title
-        fields = ('name', 'year', 'genre', 'category',)
+        fields = (
+            'name',
+            'name_prefix',
+            'year',
+            'genre',
+            'category',
+            'year_min',
+            'year_max',
+            'rating_min',
+            'rating_max',
+            'q',
+        )
+
+    def filter_name_prefix(self, queryset, name, value):
+        # Сортировка по search_name идёт по тому же индексу, что и
+        # диапазон; ?ordering= применяется позже и переопределяет её.
+        return filter_name_prefix(queryset, value).order_by(
+            'search_name', 'id'
+        )
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+
+class FilterTopTitle(FilterTitle):
+    """Фильтры /titles/top/: те же, что у списка, но без ?ordering=,
+    чтобы порядок всегда задавал взвешенный рейтинг."""
+
+    ordering = None
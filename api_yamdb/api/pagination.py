@@ -0,0 +1,209 @@
+import json
+from collections import OrderedDict
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    Cursor,
+    CursorPagination,
+    LimitOffsetPagination,
+)
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+COUNT_EXACT = 'exact'
+COUNT_CACHED = 'cached'
+COUNT_NONE = 'none'
+
+
+class KeysetPagination(CursorPagination):
+    """Keyset-пагинация по составному уникальному ключу view.cursor_ordering,
+    например ('pub_date', 'id').
+
+    В отличие от CursorPagination, курсор хранит значения всех полей
+    сортировки, поэтому смещение (offset) не нужно и любая страница
+    выбирается по индексу так же быстро, как первая.
+    """
+
+    page_size_query_param = 'limit'
+
+    def get_ordering(self, request, queryset, view):
+        return tuple(view.cursor_ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor.position if self.cursor else None
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(
+                field[1:] if field.startswith('-') else f'-{field}'
+                for field in ordering
+            )
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = self.filter_after(queryset, ordering, position)
+
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following = len(results) > len(self.page)
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_following
+        else:
+            self.has_next, self.has_previous = has_following, bool(position)
+        if not self.page:
+            self.has_next = self.has_previous = False
+        else:
+            self.next_position = self._get_position_from_instance(
+                self.page[-1], self.ordering
+            )
+            self.previous_position = self._get_position_from_instance(
+                self.page[0], self.ordering
+            )
+        self.display_page_controls = self.has_next or self.has_previous
+        return self.page
+
+    def filter_after(self, queryset, ordering, position):
+        """Строки строго после позиции курсора в порядке ordering:
+        (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ..."""
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        try:
+            return queryset.filter(condition)
+        except (ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def _get_position_from_instance(self, instance, ordering):
+        # Строки из values() приходят словарями (см. api.readers).
+        if isinstance(instance, dict):
+            values = [instance[field.lstrip('-')] for field in ordering]
+        else:
+            values = [
+                getattr(instance, field.lstrip('-')) for field in ordering
+            ]
+        return json.dumps([str(value) for value in values])
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=self.next_position)
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=self.previous_position)
+        )
+
+
+class LimitOffsetOrKeysetPagination(LimitOffsetPagination):
+    """По умолчанию limit/offset, а с параметром `?pagination=cursor`
+    (или при наличии `cursor`) — KeysetPagination.
+
+    Для limit/offset параметр `?count=` выбирает, как считать `count`:
+    exact — SELECT COUNT(*) на каждой странице, cached — COUNT(*) из кэша
+    не старше PAGINATION_COUNT_CACHE_TIMEOUT секунд, none — без `count`.
+    В режимах cached и none наличие следующей страницы определяется
+    выборкой limit + 1 строк. Допустимые режимы задаются атрибутом
+    вьюсета `pagination_count_modes`, первый из них используется
+    по умолчанию.
+    """
+
+    mode_query_param = 'pagination'
+    keyset_pagination_class = KeysetPagination
+    keyset = None
+    count_query_param = 'count'
+    count_modes = (COUNT_EXACT,)
+    count_mode = COUNT_EXACT
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.keyset_pagination_class.cursor_query_param
+            in request.query_params
+        ):
+            self.keyset = self.keyset_pagination_class()
+            page = self.keyset.paginate_queryset(queryset, request, view)
+            self.display_page_controls = self.keyset.display_page_controls
+            return page
+        self.count_mode = self.get_count_mode(request, view)
+        if self.count_mode == COUNT_EXACT:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.request = request
+        results = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(results) > self.limit
+        if self.count_mode == COUNT_CACHED:
+            self.count = self.get_cached_count(queryset)
+        return results[:self.limit]
+
+    def get_count_mode(self, request, view):
+        count_modes = getattr(view, 'pagination_count_modes', self.count_modes)
+        count_mode = request.query_params.get(self.count_query_param)
+        if count_mode in count_modes:
+            return count_mode
+        return count_modes[0]
+
+    def get_cached_count(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        key = 'pagination:count:' + md5(
+            f'{sql}{params}'.encode()
+        ).hexdigest()
+        return cache.get_or_set(
+            key,
+            lambda: self.get_count(queryset),
+            settings.PAGINATION_COUNT_CACHE_TIMEOUT,
+        )
+
+    def get_next_link(self):
+        if self.count_mode == COUNT_EXACT:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        if self.count_mode == COUNT_NONE:
+            return Response(OrderedDict([
+                ('next', self.get_next_link()),
+                ('previous', self.get_previous_link()),
+                ('results', data)
+            ]))
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.keyset is not None:
+            return self.keyset.to_html()
+        return super().to_html()
@@ -36,9 +36,10 @@ class AuthorAdminModerOrReadOnly(IsModerator):
         )
 
     def has_object_permission(self, request, view, obj):
+        # author_id, а не author: проверка не загружает автора из БД.
         return (
-            obj.author == request.user
-            or request.method in permissions.SAFE_METHODS
+            request.method in permissions.SAFE_METHODS
+            or obj.author_id == request.user.id
             or super().has_permission(request, view)
         )
 
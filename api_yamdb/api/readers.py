@@ -0,0 +1,144 @@
+"""Быстрое чтение списков: строки выбираются через values(), без
+экземпляров моделей и полей ModelSerializer, и собираются в те же
+словари, что отдают сериализаторы из api.serializers."""
+from collections import OrderedDict
+
+from rest_framework import serializers
+from reviews.models import Category, Title
+
+pub_date_field = serializers.DateTimeField()
+
+
+class Reader:
+    """Описание строки списка: колонка values() для каждого поля ответа
+    и сборка ответа. fields — поля ответа по порядку, например только
+    запрошенные через ?fields= (см. api.utils.requested_fields):
+    колонки остальных полей не выбираются."""
+
+    columns = {}
+
+    def __init__(self, fields=None):
+        self.fields = tuple(self.columns if fields is None else fields)
+
+    def values(self, queryset, extra=()):
+        """values() по колонкам полей читателя и дополнительным полям,
+        например полям сортировки для курсора."""
+        names = [self.columns[field] for field in self.fields]
+        names.extend(extra)
+        return queryset.prefetch_related(None).values(
+            *(dict.fromkeys(names) or ('pk',))
+        )
+
+    def serialize(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+    def to_representation(self, row):
+        return OrderedDict(
+            (field, self.represent(field, row)) for field in self.fields
+        )
+
+    def represent(self, field, row):
+        return row[self.columns[field]]
+
+
+class SlugNameReader(Reader):
+    """Жанры и категории, как GenreSerializer и CategorySerializer."""
+
+    columns = {'name': 'name', 'slug': 'slug'}
+
+
+class ReviewReader(Reader):
+    """Отзывы, как ReviewSerializer."""
+
+    columns = {
+        'id': 'id',
+        'text': 'text',
+        'author': 'author__username',
+        'score': 'score',
+        'pub_date': 'pub_date',
+    }
+
+    def represent(self, field, row):
+        value = super().represent(field, row)
+        if field == 'pub_date':
+            return pub_date_field.to_representation(value)
+        return value
+
+
+class CommentReader(ReviewReader):
+    """Комментарии, как CommentSerializer."""
+
+    columns = {
+        'id': 'id',
+        'text': 'text',
+        'author': 'author__username',
+        'pub_date': 'pub_date',
+    }
+
+
+class TitleReader(Reader):
+    """Произведения, как TitleReadSerializer. Жанры и категории всей
+    страницы выбираются двумя запросами, без JOIN в основном запросе:
+    так COUNT(*) пагинации остаётся запросом к одной таблице. Если
+    genre или category нет в fields, их запрос не выполняется."""
+
+    columns = {
+        'id': 'id',
+        'name': 'name',
+        'year': 'year',
+        'rating': 'rating',
+        'description': 'description',
+        'genre': 'id',
+        'category': 'category_id',
+    }
+
+    def serialize(self, rows):
+        rows = list(rows)
+        genres = {}
+        if 'genre' in self.fields:
+            genres = {row['id']: [] for row in rows}
+            links = Title.genre.through.objects.filter(
+                title_id__in=genres
+            ).values_list(
+                'title_id', 'genre_id', 'genre__name', 'genre__slug'
+            )
+            for title_id, _, name, slug in sorted(links, key=lambda x: x[1]):
+                genres[title_id].append(
+                    OrderedDict((('name', name), ('slug', slug)))
+                )
+        categories = {}
+        if 'category' in self.fields:
+            categories = {
+                category['id']: OrderedDict((
+                    ('name', category['name']),
+                    ('slug', category['slug']),
+                ))
+                for category in Category.objects.filter(
+                    id__in={row['category_id'] for row in rows}
+                ).values('id', 'name', 'slug')
+            }
+        return [
+            self.to_representation(
+                row,
+                genres.get(row.get('id')),
+                categories.get(row.get('category_id')),
+            )
+            for row in rows
+        ]
+
+    def to_representation(self, row, genres=None, category=None):
+        nested = {'genre': genres, 'category': category}
+        return OrderedDict(
+            (
+                field,
+                nested[field] if field in nested
+                else self.represent(field, row),
+            )
+            for field in self.fields
+        )
+
+    def represent(self, field, row):
+        value = super().represent(field, row)
+        if field == 'rating' and value is not None:
+            return round(value)
+        return value
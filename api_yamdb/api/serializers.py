@@ -1,17 +1,102 @@
 from django.conf import settings
 from django.contrib.auth.hashers import make_password
 from django.core.mail import send_mail
-from django.db.models import Avg
 from rest_framework import exceptions, serializers
 from rest_framework_simplejwt.serializers import (
     PasswordField,
     TokenObtainPairSerializer,
 )
+from rest_framework.relations import MANY_RELATION_KWARGS, ManyRelatedField
 from reviews.models import Category, Comment, Genre, Review, Title
 from users.models import User
 
-
-class CommentSerializer(serializers.ModelSerializer):
+from .utils import requested_fields
+
+
+def resolve_slugs(queryset, slug_field, slugs):
+    """Объекты queryset по набору слагов одним запросом slug__in."""
+    return {
+        getattr(obj, slug_field): obj
+        for obj in queryset.filter(**{f'{slug_field}__in': set(slugs)})
+    }
+
+
+class BatchSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, который с many=True находит все слаги одним
+    запросом и сообщает обо всех неизвестных слагах сразу.
+
+    Если слаги уже найдены для целой пачки элементов, они передаются
+    в context['slug_objects'][модель] и запросов нет совсем (api.bulk).
+    """
+
+    default_error_messages = {
+        'does_not_exist_many': 'Не найдены объекты с {slug_name}: {values}.',
+    }
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BatchManyRelatedField(**list_kwargs)
+
+    def get_objects(self, slugs):
+        queryset = self.get_queryset()
+        objects = self.context.get('slug_objects', {}).get(queryset.model)
+        if objects is None:
+            objects = resolve_slugs(queryset, self.slug_field, slugs)
+        return objects
+
+    def to_internal_value(self, data):
+        return self.to_internal_value_many([data], single=True)[0]
+
+    def to_internal_value_many(self, data, single=False):
+        if not all(isinstance(slug, str) for slug in data):
+            self.fail('invalid')
+        slugs = list(dict.fromkeys(data))
+        objects = self.get_objects(slugs)
+        unknown = [slug for slug in slugs if slug not in objects]
+        if single and unknown:
+            self.fail(
+                'does_not_exist', slug_name=self.slug_field, value=unknown[0]
+            )
+        if unknown:
+            self.fail(
+                'does_not_exist_many',
+                slug_name=self.slug_field,
+                values=', '.join(unknown),
+            )
+        return [objects[slug] for slug in slugs]
+
+
+class BatchManyRelatedField(ManyRelatedField):
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        return self.child_relation.to_internal_value_many(data)
+
+
+class SparseFieldsMixin:
+    """Сокращает ответ корневого сериализатора до полей из ?fields=
+    без полей из ?omit=. Вложенные сериализаторы отдаются целиком."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return fields
+        return {
+            name: fields[name]
+            for name in requested_fields(self.context.get('request'), fields)
+        }
+
+
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = serializers.StringRelatedField()
 
     class Meta:
@@ -24,7 +109,7 @@ class CommentSerializer(serializers.ModelSerializer):
         )
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     score = serializers.IntegerField(required=True)
     author = serializers.StringRelatedField()
 
@@ -46,7 +131,19 @@ class ReviewSerializer(serializers.ModelSerializer):
         )
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class ReviewSearchSerializer(ReviewSerializer):
+    class Meta(ReviewSerializer.Meta):
+        fields = ReviewSerializer.Meta.fields + ('title',)
+
+
+class CommentSearchSerializer(CommentSerializer):
+    title = serializers.IntegerField(source='review.title_id')
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ('review', 'title',)
+
+
+class GenreSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         lookup_field = 'slug'
@@ -56,7 +153,7 @@ class GenreSerializer(serializers.ModelSerializer):
         )
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         lookup_field = 'slug'
@@ -66,7 +163,7 @@ class CategorySerializer(serializers.ModelSerializer):
         )
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleReadSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     genre = GenreSerializer(
         many=True,
     )
@@ -87,21 +184,63 @@ class TitleReadSerializer(serializers.ModelSerializer):
         )
 
     def get_rating(self, obj):
-        queryset_avg = Title.objects.annotate(rating=Avg('reviews__score'))
-        title = queryset_avg.get(pk=obj.pk)
-        if title.rating is None:
+        if obj.rating is None:
             return None
-        return round(title.rating)
+        return round(obj.rating)
+
+
+class RatingDistributionSerializer(
+    SparseFieldsMixin, serializers.ModelSerializer
+):
+    counts = serializers.SerializerMethodField()
+    mean = serializers.SerializerMethodField()
+    median = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Title
+        fields = (
+            'id',
+            'review_count',
+            'counts',
+            'mean',
+            'median',
+        )
+
+    def get_counts(self, obj):
+        return {
+            str(score): count
+            for score, count in enumerate(
+                obj.score_counts, settings.MIN_SCORE
+            )
+        }
+
+    def get_mean(self, obj):
+        if obj.rating is None:
+            return None
+        return round(obj.rating, 2)
+
+    def get_median(self, obj):
+        if not obj.review_count:
+            return None
+        middle = ((obj.review_count - 1) // 2, obj.review_count // 2)
+        values = []
+        seen = 0
+        for score, count in enumerate(obj.score_counts, settings.MIN_SCORE):
+            for position in middle:
+                if seen <= position < seen + count:
+                    values.append(score)
+            seen += count
+        return sum(values) / len(values)
 
 
 class TitleWriteSerializer(serializers.ModelSerializer):
-    genre = serializers.SlugRelatedField(
+    genre = BatchSlugRelatedField(
         slug_field='slug',
         queryset=Genre.objects.all(),
         many=True,
         required=True,
     )
-    category = serializers.SlugRelatedField(
+    category = BatchSlugRelatedField(
         slug_field='slug',
         queryset=Category.objects.all(),
         required=True,
@@ -119,7 +258,22 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         )
 
     def to_representation(self, value):
-        return TitleReadSerializer(value).data
+        return TitleReadSerializer(value, context=self.context).data
+
+
+class TitleBulkItemSerializer(TitleWriteSerializer):
+    """Элемент массовой записи произведений: с id заменяет
+    существующее произведение (см. api.bulk)."""
+
+    id = serializers.IntegerField(required=False)
+
+
+class TitleIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.TITLE_BATCH_MAX_IDS,
+    )
 
 
 class UserCreateSerializer(serializers.ModelSerializer):
@@ -148,7 +302,7 @@ class UserCreateSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = (
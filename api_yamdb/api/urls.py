@@ -2,8 +2,10 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenObtainPairView
 
-from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                    ReviewViewSet, SignUpViewSet, TitleViewSet, UserViewSet)
+from .views import (AutocompleteViewSet, CategoryViewSet,
+                    CommentSearchViewSet, CommentViewSet, ExportViewSet,
+                    GenreViewSet, ReviewSearchViewSet, ReviewViewSet,
+                    SignUpViewSet, TitleViewSet, UserViewSet)
 
 router_v1 = DefaultRouter()
 router_v1.register('users', UserViewSet, basename='users')
@@ -18,10 +20,29 @@ router_v1.register(
     CommentViewSet,
     basename='comments',
 )
+router_v1.register(
+    'search/reviews', ReviewSearchViewSet, basename='search-reviews'
+)
+router_v1.register(
+    'search/comments', CommentSearchViewSet, basename='search-comments'
+)
+router_v1.register(
+    'autocomplete', AutocompleteViewSet, basename='autocomplete'
+)
 router_v1.register('auth/signup', SignUpViewSet, basename='signup')
 
 urlpatterns = [
     path('v1/', include(router_v1.urls)),
+    path(
+        'v1/export/titles.ndjson',
+        ExportViewSet.as_view({'get': 'titles'}),
+        name='export-titles',
+    ),
+    path(
+        'v1/export/reviews.csv',
+        ExportViewSet.as_view({'get': 'reviews'}),
+        name='export-reviews',
+    ),
     path(
         'v1/auth/token/',
         TokenObtainPairView.as_view(),
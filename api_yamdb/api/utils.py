@@ -1,17 +1,57 @@
+from rest_framework.permissions import SAFE_METHODS
 from reviews.models import Review, Title
 
 from .exceptions import TitleNotExist
 
 
 def serch_title(id):
-    if Title.objects.filter(id=id).exists():
-        title = Title.objects.get(id=id)
-        return title
-    raise TitleNotExist('Вы ввели номер поста которого не существует')
+    try:
+        return Title.objects.get(id=id)
+    except Title.DoesNotExist:
+        raise TitleNotExist('Вы ввели номер поста которого не существует')
 
 
-def serch_review(id):
-    if Review.objects.filter(id=id).exists():
-        review = Review.objects.get(id=id)
-        return review
-    raise TitleNotExist('Вы ввели номер поста которого не существует')
+def serch_review(title_id, review_id):
+    """Отзыв из URL вместе с проверкой, что он относится к произведению
+    title_id: одного запроса достаточно, так как title_id хранится
+    в строке отзыва."""
+    try:
+        return Review.objects.get(id=review_id, title_id=title_id)
+    except Review.DoesNotExist:
+        raise TitleNotExist('Вы ввели номер поста которого не существует')
+
+
+def query_names(request, param):
+    return {
+        name.strip()
+        for value in request.query_params.getlist(param)
+        for name in value.split(',')
+        if name.strip()
+    }
+
+
+def requested_fields(request, names):
+    """Поля ответа из names, оставшиеся после ?fields= и ?omit=
+    (списки через запятую), в исходном порядке. Неизвестные имена
+    пропускаются; если в ?fields= нет ни одного известного имени, он
+    не учитывается, чтобы не отдавать пустые объекты. Ответы на
+    изменяющие запросы не сокращаются."""
+    if request is None or request.method not in SAFE_METHODS:
+        return tuple(names)
+    fields = query_names(request, 'fields').intersection(names)
+    omit = query_names(request, 'omit')
+    return tuple(
+        name for name in names
+        if (not fields or name in fields) and name not in omit
+    )
+
+
+def select_requested(queryset, fields, related):
+    """select_related только для связей запрошенных полей ответа:
+    related — {поле ответа: связь}."""
+    names = [
+        relation for field, relation in related.items() if field in fields
+    ]
+    if not names:
+        return queryset
+    return queryset.select_related(*names)
@@ -1,59 +1,134 @@
-from django.db.models import Avg
+from django.conf import settings
+from django.db.models import Prefetch
 from django.db.utils import IntegrityError
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import exceptions, filters, mixins, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.autocomplete import autocomplete_index
+from reviews.search import fts_search
 from users.models import User
 
+from .bulk import save_titles
+from .caching import (
+    CachedListMixin,
+    CachedRetrieveMixin,
+    ConditionalGetMixin,
+    StaleListMixin,
+)
 from .exceptions import ExistRewies
-from .filter import FilterTitle
+from .export import reviews_csv, titles_ndjson
+from .filter import FilterTitle, FilterTopTitle, NamePrefixFilter
+from .pagination import (
+    COUNT_CACHED,
+    COUNT_EXACT,
+    COUNT_NONE,
+    KeysetPagination,
+    LimitOffsetOrKeysetPagination,
+)
+from .readers import CommentReader, ReviewReader, SlugNameReader, TitleReader
 from .permissions import (
     AuthorAdminModerOrReadOnly,
+    IsAdmin,
     IsAdminOrReadOnly,
     IsAdminOrSelf,
+    IsModerator,
 )
 from .serializers import (
     CategorySerializer,
+    CommentSearchSerializer,
     CommentSerializer,
     GenreSerializer,
+    RatingDistributionSerializer,
+    ReviewSearchSerializer,
     ReviewSerializer,
+    TitleIdsSerializer,
     TitleReadSerializer,
     TitleWriteSerializer,
     UserCreateSerializer,
     UserSerializer,
 )
-from .utils import serch_review, serch_title
+from .utils import (
+    requested_fields,
+    select_requested,
+    serch_review,
+    serch_title,
+)
+
+
+class ValuesListMixin:
+    """list() через values() и reader_class из api.readers: строки не
+    превращаются в экземпляры моделей и не проходят ModelSerializer,
+    JSON ответа тот же. Выбираются только колонки полей из ?fields=."""
+
+    reader_class = None
+
+    def list(self, request, *args, **kwargs):
+        reader = self.reader_class(
+            requested_fields(request, self.reader_class.columns)
+        )
+        ordering = getattr(self, 'cursor_ordering', ())
+        queryset = reader.values(
+            self.filter_queryset(self.get_queryset()),
+            extra=tuple(field.lstrip('-') for field in ordering),
+        )
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(reader.serialize(queryset))
+        return self.get_paginated_response(reader.serialize(page))
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(
+    ConditionalGetMixin, ValuesListMixin, viewsets.ModelViewSet
+):
     """Вьюсет для взаимодействия с отзывами в БД,
     привязанным к произведениям, через API."""
 
     serializer_class = ReviewSerializer
+    reader_class = ReviewReader
     permission_classes = (AuthorAdminModerOrReadOnly,)
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetOrKeysetPagination
+    pagination_count_modes = (COUNT_EXACT, COUNT_CACHED, COUNT_NONE)
+    cursor_ordering = ('pub_date', 'id')
+    last_modified_field = 'pub_date'
+
+    @cached_property
+    def title(self):
+        """Произведение из URL, запрашивается один раз за запрос."""
+        return serch_title(self.kwargs.get('title_id'))
+
+    def get_etag_versions(self):
+        # Счётчик произведения меняется и при его удалении, когда
+        # отзывов нет: иначе на устаревший ETag ответом был бы 304.
+        return (
+            ('reviews', self.kwargs.get('title_id')),
+            ('title', self.kwargs.get('title_id')),
+        )
 
     def get_queryset(self):
-        title = serch_title(self.kwargs.get('title_id'))
-        rewiews = Review.objects.filter(title=title)
+        rewiews = select_requested(
+            Review.objects.filter(title=self.title),
+            requested_fields(self.request, ReviewSerializer.Meta.fields),
+            {'author': 'author'},
+        ).order_by(*self.cursor_ordering)
         return rewiews
 
     def perform_create(self, serializer):
-        title = serch_title(self.kwargs.get('title_id'))
         if Review.objects.filter(
-            author=self.request.user, title=title
+            author=self.request.user, title=self.title
         ).exists():
             raise ExistRewies('Вы уже писали отзыв')
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author=self.request.user, title=self.title)
 
     def perform_update(self, serializer):
-        title = serch_title(self.kwargs.get('title_id'))
         if Review.objects.filter(
             author=self.request.user,
-            title=title,
+            title=self.title,
         ).exists():
             try:
                 serializer.save()
@@ -61,22 +136,120 @@ class ReviewViewSet(viewsets.ModelViewSet):
                 Response(status=status.HTTP_400_BAD_REQUEST)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ConditionalGetMixin, ValuesListMixin, viewsets.ModelViewSet
+):
     """Вьюсет для взаимодействия с комментариями,
     привязынными к отзывам в БД, через API."""
 
     serializer_class = CommentSerializer
+    reader_class = CommentReader
     permission_classes = (AuthorAdminModerOrReadOnly,)
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetOrKeysetPagination
+    pagination_count_modes = (COUNT_EXACT, COUNT_CACHED, COUNT_NONE)
+    cursor_ordering = ('pub_date', 'id')
+    last_modified_field = 'pub_date'
+
+    @cached_property
+    def review(self):
+        """Отзыв из URL, запрашивается один раз за запрос."""
+        return serch_review(
+            self.kwargs.get('title_id'), self.kwargs.get('review_id')
+        )
+
+    def get_etag_versions(self):
+        # ('reviews', title_id) меняется при удалении отзыва, даже без
+        # комментариев, и при удалении произведения с отзывами.
+        return (
+            ('comments', self.kwargs.get('review_id')),
+            ('reviews', self.kwargs.get('title_id')),
+        )
 
     def get_queryset(self):
-        review = serch_review(self.kwargs.get('review_id'))
-        comments = Comment.objects.filter(review=review)
+        comments = select_requested(
+            Comment.objects.filter(review=self.review),
+            requested_fields(self.request, CommentSerializer.Meta.fields),
+            {'author': 'author'},
+        ).order_by(*self.cursor_ordering)
         return comments
 
     def perform_create(self, serializer):
-        review = serch_review(self.kwargs.get('review_id'))
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.review)
+
+
+class TextSearchViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Полнотекстовый поиск по тексту отзывов или комментариев
+    для модераторов: `?q=`, новые записи первыми, keyset-пагинация."""
+
+    permission_classes = (IsModerator,)
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-pub_date', '-id')
+    related_fields = {}
+
+    def get_queryset(self):
+        text = self.request.query_params.get('q', '')
+        queryset = select_requested(
+            self.queryset.all(),
+            requested_fields(self.request, self.serializer_class.Meta.fields),
+            self.related_fields,
+        )
+        return fts_search(queryset, text, 'text', rank=False)
+
+
+class ReviewSearchViewSet(TextSearchViewSet):
+    queryset = Review.objects.all()
+    serializer_class = ReviewSearchSerializer
+    related_fields = {'author': 'author'}
+
+
+class CommentSearchViewSet(TextSearchViewSet):
+    queryset = Comment.objects.all()
+    serializer_class = CommentSearchSerializer
+    related_fields = {'author': 'author', 'title': 'review'}
+
+
+class AutocompleteViewSet(viewsets.ViewSet):
+    """Автодополнение по префиксу названия произведений, жанров и
+    категорий из индекса в памяти, без запросов к БД."""
+
+    permission_classes = (AllowAny,)
+    default_limit = 10
+    max_limit = 50
+
+    def list(self, request):
+        try:
+            limit = min(
+                int(request.query_params.get('limit', self.default_limit)),
+                self.max_limit,
+            )
+        except ValueError:
+            limit = self.default_limit
+        return Response(autocomplete_index.search(
+            request.query_params.get('q', ''), max(limit, 1)
+        ))
+
+
+class ExportViewSet(viewsets.ViewSet):
+    """Потоковая выгрузка всего каталога и отзывов для администраторов
+    (см. api.export)."""
+
+    permission_classes = (IsAdmin,)
+
+    def titles(self, request):
+        response = StreamingHttpResponse(
+            titles_ndjson(), content_type='application/x-ndjson'
+        )
+        response['Content-Disposition'] = (
+            'attachment; filename="titles.ndjson"'
+        )
+        return response
+
+    def reviews(self, request):
+        response = StreamingHttpResponse(
+            reviews_csv(), content_type='text/csv; charset=utf-8'
+        )
+        response['Content-Disposition'] = 'attachment; filename="reviews.csv"'
+        return response
 
 
 class SignUpViewSet(viewsets.GenericViewSet, mixins.CreateModelMixin):
@@ -149,6 +322,8 @@ class UserViewSet(viewsets.ModelViewSet):
 
 
 class ListCreateDeleteViewSet(
+    CachedListMixin,
+    ValuesListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -156,8 +331,9 @@ class ListCreateDeleteViewSet(
 ):
     pagination_class = LimitOffsetPagination
     permission_classes = (IsAdminOrReadOnly,)
-    filter_backends = (filters.SearchFilter,)
+    filter_backends = (filters.SearchFilter, NamePrefixFilter)
     search_fields = ('name',)
+    reader_class = SlugNameReader
     lookup_field = 'slug'
 
 
@@ -171,18 +347,130 @@ class GenreViewSet(ListCreateDeleteViewSet):
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    ConditionalGetMixin,
+    CachedRetrieveMixin,
+    StaleListMixin,
+    ValuesListMixin,
+    viewsets.ModelViewSet,
+):
     permission_classes = (IsAdminOrReadOnly,)
-    pagination_class = LimitOffsetPagination
+    reader_class = TitleReader
+    pagination_class = LimitOffsetOrKeysetPagination
+    pagination_count_modes = (COUNT_EXACT, COUNT_CACHED, COUNT_NONE)
     filter_backends = (DjangoFilterBackend,)
-    filterset_class = FilterTitle
+    conditional_actions = ('retrieve',)
+
+    @property
+    def filterset_class(self):
+        if self.action == 'top':
+            return FilterTopTitle
+        return FilterTitle
+
+    @property
+    def cursor_ordering(self):
+        if self.action == 'top':
+            return ('-weighted_rating', 'name', 'id')
+        return ('name', 'id')
+
+    def get_etag_versions(self):
+        # Жанры и категории вложены в ответ, их правка меняет все ETag.
+        return (
+            ('title', self.kwargs.get('pk')),
+            ('genres', 'list'),
+            ('categories', 'list'),
+        )
 
     def get_serializer_class(self):
-        if self.action in ('list', 'retrieve'):
+        if self.action in ('list', 'retrieve', 'top'):
             return TitleReadSerializer
+        if self.action == 'rating_distribution':
+            return RatingDistributionSerializer
         return TitleWriteSerializer
 
     def get_queryset(self):
-        return Title.objects.annotate(rating=Avg('reviews__score')).order_by(
-            'name'
+        if self.action == 'rating_distribution':
+            return Title.objects.only('review_count', 'rating', 'score_counts')
+        fields = requested_fields(
+            self.request, TitleReadSerializer.Meta.fields
+        )
+        queryset = select_requested(
+            Title.objects.all(), fields, {'category': 'category'}
         )
+        if 'genre' in fields:
+            queryset = queryset.prefetch_related(
+                Prefetch('genre', queryset=Genre.objects.order_by('id'))
+            )
+        if self.action == 'top':
+            return queryset.filter(weighted_rating__isnull=False).order_by(
+                '-weighted_rating', 'name'
+            )
+        return queryset.order_by('name')
+
+    def list(self, request, *args, **kwargs):
+        if self.action == 'list' and 'ids' in request.query_params:
+            ids = request.query_params['ids'].split(',')
+            return self.titles_by_ids({'ids': ids})
+        return super().list(request, *args, **kwargs)
+
+    def titles_by_ids(self, data):
+        """Произведения по списку id в запрошенном порядке и список
+        ненайденных id. Запросов три при любом числе id: произведения,
+        их жанры и категории."""
+        serializer = TitleIdsSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data['ids']))
+        reader = TitleReader(
+            requested_fields(self.request, TitleReader.columns)
+        )
+        rows = {
+            row['id']: row
+            for row in reader.values(
+                Title.objects.filter(id__in=ids), extra=('id',)
+            )
+        }
+        return Response({
+            'results': reader.serialize(
+                rows[pk] for pk in ids if pk in rows
+            ),
+            'missing': [pk for pk in ids if pk not in rows],
+        })
+
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='batch-get',
+        permission_classes=(AllowAny,),
+    )
+    def batch_get(self, request):
+        """То же, что `?ids=`, но список id передаётся в теле запроса:
+        {"ids": [1, 2, 3]}."""
+        return self.titles_by_ids(request.data)
+
+    @action(detail=True, url_path='rating-distribution')
+    def rating_distribution(self, request, pk=None):
+        serializer = self.get_serializer(self.get_object())
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Массовое создание и замена произведений (см. api.bulk):
+        ошибки возвращаются по элементам, остальные элементы
+        сохраняются."""
+        if not isinstance(request.data, list):
+            raise exceptions.ValidationError(
+                {'non_field_errors': ['Ожидается список произведений.']}
+            )
+        if len(request.data) > settings.TITLE_BULK_MAX_ITEMS:
+            raise exceptions.ValidationError({'non_field_errors': [
+                'Не больше {} произведений за запрос.'.format(
+                    settings.TITLE_BULK_MAX_ITEMS
+                )
+            ]})
+        return Response({'results': save_titles(request.data)})
+
+    @action(detail=False)
+    def top(self, request):
+        """Произведения по убыванию взвешенного рейтинга, с теми же
+        фильтрами по жанру и категории, что и у списка."""
+        return self.list(request)
@@ -139,6 +139,31 @@ ROLE_ADMIN = "admin"
 ROLE_ADMIN_NAME = "Администратор"
 MIN_SCORE = 1
 MAX_SCORE = 10
+# Байесовский взвешенный рейтинг: сколько «средних» оценок добавляется
+# к оценкам произведения и как долго кэшируется средняя оценка по сайту.
+RATING_MIN_VOTES = 10
+RATING_MEAN_TIMEOUT = 60 * 10
+# Сколько секунд может устаревать `count` в режиме пагинации ?count=cached.
+PAGINATION_COUNT_CACHE_TIMEOUT = 60
+# Сколько секунд хранятся закэшированные ответы; при записи кэш
+# сбрасывается сразу через версию (reviews.versions).
+LIST_CACHE_TIMEOUT = 60 * 60
+DETAIL_CACHE_TIMEOUT = 60 * 60
+# Сколько секунд после построения страницу списка произведений можно
+# отдавать устаревшей, пока фоновый поток строит свежую.
+LIST_MAX_STALE = 30
+# Сколько секунд ждать, пока другой процесс строит тот же ответ для
+# кэша, и как часто проверять, готов ли он.
+RESPONSE_CACHE_LOCK_TIMEOUT = 5
+RESPONSE_CACHE_LOCK_POLL = 0.05
+# Сколько потоков процесса одновременно обновляют устаревшие страницы.
+RESPONSE_REFRESH_WORKERS = 2
+# Сколько строк читается из БД за раз при выгрузке /api/v1/export/.
+EXPORT_CHUNK_SIZE = 2000
+# Сколько произведений можно передать в POST /api/v1/titles/bulk/.
+TITLE_BULK_MAX_ITEMS = 5000
+# Сколько id можно запросить в /api/v1/titles/?ids= и batch-get.
+TITLE_BATCH_MAX_IDS = 500
 
 
 LANGUAGE_CODE = "ru-RU"
@@ -24,7 +24,7 @@ class ReviewAdmin(admin.ModelAdmin):
         'score',
         'pub_date',
     )
-    search_fields = ('author', 'title', 'text')
+    search_fields = ('author__username', 'title__name', 'text')
     list_filter = ('author',)
     empty_value_display = '-пусто-'
 
@@ -37,7 +37,7 @@ class CommentAdmin(admin.ModelAdmin):
         'text',
         'pub_date',
     )
-    search_fields = ('author', 'text', 'pub_date')
+    search_fields = ('author__username', 'text')
     list_filter = ('author',)
 
 
@@ -0,0 +1,149 @@
+"""Индекс для автодополнения по названиям произведений, жанров и
+категорий, который живёт в памяти процесса.
+
+Ключи каждого вида объектов хранятся в своём отсортированном списке,
+поиск по префиксу — bisect и не больше limit совпадений на вид,
+поэтому запрос к индексу не обращается к БД и не зависит от общего
+числа совпадений. Чтение и запись индекса идут под одной
+блокировкой. Запись в каталог патчит индекс текущего процесса и
+увеличивает версию в кэше Django; другие процессы видят новую версию
+и перестраивают свой индекс. Версия
+синхронизируется между процессами только при общем кэше (Redis,
+Memcached); с LocMemCache каждый процесс видит лишь свои изменения.
+"""
+import threading
+from bisect import bisect_left, insort
+
+from django.core.cache import cache
+
+from .models import Category, Genre, Title
+from .search import normalize_search_key
+
+VERSION_CACHE_KEY = 'autocomplete:version'
+KINDS = {
+    'titles': Title,
+    'genres': Genre,
+    'categories': Category,
+}
+
+
+def object_kind(instance):
+    for kind, model in KINDS.items():
+        if isinstance(instance, model):
+            return kind
+    return None
+
+
+def object_data(kind, instance):
+    if kind == 'titles':
+        return {'id': instance.id, 'name': instance.name}
+    return {'name': instance.name, 'slug': instance.slug}
+
+
+def object_keys(name):
+    """Ключи для каждого слова названия: «Крепкий орешек» находится и
+    по «креп», и по «ореш»."""
+    words = normalize_search_key(name).split()
+    return [' '.join(words[start:]) for start in range(len(words))]
+
+
+class PrefixIndex:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.entries = {kind: [] for kind in KINDS}
+        self.objects = {}
+
+    def rebuild(self):
+        version = cache.get_or_set(VERSION_CACHE_KEY, 0, None)
+        entries, objects = {kind: [] for kind in KINDS}, {}
+        for kind, model in KINDS.items():
+            fields = ('id', 'name') if kind == 'titles' else (
+                'id', 'name', 'slug'
+            )
+            for instance in model.objects.only(*fields):
+                objects[(kind, instance.id)] = object_data(kind, instance)
+                entries[kind].extend(
+                    (key, instance.id) for key in object_keys(instance.name)
+                )
+            entries[kind].sort()
+        with self.lock:
+            self.entries, self.objects = entries, objects
+            self.version = version
+
+    def ensure_fresh(self):
+        if self.version is None or self.version != cache.get(
+            VERSION_CACHE_KEY
+        ):
+            self.rebuild()
+
+    def search(self, text, limit):
+        """До limit совпадений по префиксу для каждого вида объектов."""
+        self.ensure_fresh()
+        prefix = normalize_search_key(text)
+        results = {kind: [] for kind in KINDS}
+        if not prefix:
+            return results
+        with self.lock:
+            for kind, entries in self.entries.items():
+                seen = set()
+                position = bisect_left(entries, (prefix,))
+                while position < len(entries) and len(seen) < limit:
+                    key, pk = entries[position]
+                    position += 1
+                    if not key.startswith(prefix):
+                        break
+                    if pk not in seen:
+                        seen.add(pk)
+                        results[kind].append(self.objects[(kind, pk)])
+        return results
+
+    def update(self, instance):
+        kind = object_kind(instance)
+        if self.version is None:
+            self._bump_version()
+            return
+        with self.lock:
+            self._remove(kind, instance.id)
+            self.objects[(kind, instance.id)] = object_data(kind, instance)
+            for key in object_keys(instance.name):
+                insort(self.entries[kind], (key, instance.id))
+        self._bump_version()
+
+    def remove(self, kind, pk):
+        with self.lock:
+            self._remove(kind, pk)
+        self._bump_version()
+
+    def invalidate(self):
+        """Перестроить индекс во всех процессах, например после
+        bulk_create, который не отправляет сигналы."""
+        with self.lock:
+            self.version = None
+        self._bump_version()
+
+    def _remove(self, kind, pk):
+        data = self.objects.pop((kind, pk), None)
+        if data is None:
+            return
+        entries = self.entries[kind]
+        for key in object_keys(data['name']):
+            position = bisect_left(entries, (key, pk))
+            if entries[position:position + 1] == [(key, pk)]:
+                del entries[position]
+
+    def _bump_version(self):
+        # Свои изменения уже в индексе, поэтому версия процесса
+        # сдвигается вместе с общей и перестройки не будет.
+        try:
+            version = cache.incr(VERSION_CACHE_KEY)
+        except ValueError:
+            version = 1
+            cache.set(VERSION_CACHE_KEY, version, None)
+        if self.version is not None and self.version + 1 == version:
+            self.version = version
+        else:
+            self.version = None
+
+
+autocomplete_index = PrefixIndex()
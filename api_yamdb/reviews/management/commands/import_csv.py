@@ -65,6 +65,11 @@ def import_csv(file_name, class_name):
         data_csv = dict(zip(data[0], row))
         data_csv = change_fk_values(data_csv)
         try:
+            if class_name is ThroughModel:
+                # Для промежуточной таблицы сигналы post_save не
+                # отправляются, а add() отправляет m2m_changed.
+                data_csv['title'].genre.add(data_csv['genre'])
+                continue
             table = class_name(**data_csv)
             table.save()
         except (ValueError, IntegrityError) as error:
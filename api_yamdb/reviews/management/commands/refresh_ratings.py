@@ -0,0 +1,11 @@
+from django.core.management import BaseCommand
+
+from reviews.ranking import refresh_weighted_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает взвешенный рейтинг произведений.'
+
+    def handle(self, *args, **options):
+        count = refresh_weighted_ratings()
+        print(f'Взвешенный рейтинг пересчитан для {count} произведений.')
@@ -0,0 +1,38 @@
+# Generated by Django 3.2 on 2026-10-18 17:57
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+import reviews.models
+
+
+def fill_score_counts(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    score_counts = {}
+    rows = Review.objects.values('title_id', 'score').annotate(
+        count=Count('id')
+    ).order_by()
+    for row in rows:
+        counts = score_counts.setdefault(
+            row['title_id'], reviews.models.empty_score_counts()
+        )
+        counts[row['score'] - settings.MIN_SCORE] = row['count']
+    for title_id, counts in score_counts.items():
+        Title.objects.filter(pk=title_id).update(score_counts=counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_rating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='score_counts',
+            field=models.JSONField(default=reviews.models.empty_score_counts, editable=False, verbose_name='Распределение оценок'),
+        ),
+        migrations.RunPython(fill_score_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 3.2 on 2026-10-18 17:58
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, FloatField, Sum
+from django.db.models.functions import Cast
+
+
+def fill_weighted_rating(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    stats = Title.objects.aggregate(
+        rating_sum=Sum('rating_sum'),
+        review_count=Sum('review_count'),
+    )
+    if not stats['review_count']:
+        return
+    mean_rating = stats['rating_sum'] / stats['review_count']
+    min_votes = settings.RATING_MIN_VOTES
+    Title.objects.filter(review_count__gt=0).update(
+        weighted_rating=(
+            Cast(F('rating_sum'), FloatField()) + min_votes * mean_rating
+        ) / (F('review_count') + min_votes)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_title_score_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Взвешенный рейтинг'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-weighted_rating', 'name'], name='title_weighted_rating_idx'),
+        ),
+        migrations.RunPython(fill_weighted_rating, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2 on 2026-10-18 18:07
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_keyset_indexes'),
+    ]
+
+    # Через-таблица M2M создаётся Django автоматически, и задать ей
+    # Meta.indexes нельзя, поэтому составной индекс создаётся SQL-запросом.
+    # Индекс покрывает фильтр произведений по жанру: genre_id -> title_id.
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX "reviews_title_genre_genre_title_idx" '
+            'ON "reviews_title_genre" ("genre_id", "title_id");',
+            'DROP INDEX "reviews_title_genre_genre_title_idx";',
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 3.2 on 2026-10-18 18:09
+
+from django.db import migrations
+
+CREATE_TITLE_FTS = (
+    'CREATE VIRTUAL TABLE "reviews_title_fts" USING fts5('
+    'name, description, content="reviews_title", content_rowid="id", '
+    'tokenize="unicode61 remove_diacritics 2")',
+    'CREATE TRIGGER "reviews_title_fts_insert" AFTER INSERT ON "reviews_title" '
+    'BEGIN '
+    'INSERT INTO "reviews_title_fts"(rowid, name, description) '
+    'VALUES (new.id, new.name, new.description); '
+    'END',
+    'CREATE TRIGGER "reviews_title_fts_delete" AFTER DELETE ON "reviews_title" '
+    'BEGIN '
+    'INSERT INTO "reviews_title_fts"("reviews_title_fts", rowid, name, '
+    'description) VALUES (\'delete\', old.id, old.name, old.description); '
+    'END',
+    'CREATE TRIGGER "reviews_title_fts_update" '
+    'AFTER UPDATE OF name, description ON "reviews_title" '
+    'BEGIN '
+    'INSERT INTO "reviews_title_fts"("reviews_title_fts", rowid, name, '
+    'description) VALUES (\'delete\', old.id, old.name, old.description); '
+    'INSERT INTO "reviews_title_fts"(rowid, name, description) '
+    'VALUES (new.id, new.name, new.description); '
+    'END',
+    'INSERT INTO "reviews_title_fts"("reviews_title_fts") VALUES (\'rebuild\')',
+)
+DROP_TITLE_FTS = (
+    'DROP TRIGGER IF EXISTS "reviews_title_fts_insert"',
+    'DROP TRIGGER IF EXISTS "reviews_title_fts_delete"',
+    'DROP TRIGGER IF EXISTS "reviews_title_fts_update"',
+    'DROP TABLE IF EXISTS "reviews_title_fts"',
+)
+
+
+def run_on_sqlite(statements):
+    # FTS5 есть только в SQLite, на других СУБД api.filter ищет через
+    # icontains (см. reviews.search).
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0009_title_category_name_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_on_sqlite(CREATE_TITLE_FTS), run_on_sqlite(DROP_TITLE_FTS)
+        ),
+    ]
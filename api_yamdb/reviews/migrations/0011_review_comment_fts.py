@@ -0,0 +1,30 @@
+# Generated by Django 3.2 on 2026-10-18 18:10
+
+from django.db import migrations
+
+from reviews.search import fts_statements
+
+
+def run_on_sqlite(create):
+    # FTS5 есть только в SQLite, на других СУБД поиск идёт через
+    # icontains (см. reviews.search).
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for model_name in ('Review', 'Comment'):
+            model = apps.get_model('reviews', model_name)
+            statements = fts_statements(model, ('text',))[0 if create else 1]
+            for statement in statements:
+                schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_title_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_on_sqlite(True), run_on_sqlite(False)),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 3.2 on 2026-10-18 18:13
+
+from django.db import migrations, models
+
+from reviews.search import fts_statements, normalize_search_key
+
+
+def fill_search_name(apps, schema_editor):
+    for model_name in ('Title', 'Genre', 'Category'):
+        model = apps.get_model('reviews', model_name)
+        objects = list(model.objects.only('id', 'name'))
+        for obj in objects:
+            obj.search_name = normalize_search_key(obj.name)
+        model.objects.bulk_update(objects, ['search_name'], batch_size=500)
+
+
+def recreate_title_fts(apps, schema_editor):
+    # SQLite добавляет колонку через пересоздание reviews_title, и
+    # триггеры FTS-индекса из 0010 удаляются вместе со старой таблицей.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    create, drop = fts_statements(
+        apps.get_model('reviews', 'Title'), ('name', 'description')
+    )
+    for statement in drop + create:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_review_comment_fts'),
+    ]
+
+    operations = [
+        # При откате RemoveField тоже пересоздаёт таблицу, поэтому
+        # триггеры восстанавливаются последним шагом отката.
+        migrations.RunPython(migrations.RunPython.noop, recreate_title_fts),
+        migrations.AddField(
+            model_name='category',
+            name='search_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256, verbose_name='Ключ поиска'),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='search_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256, verbose_name='Ключ поиска'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='search_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256, verbose_name='Ключ поиска'),
+        ),
+        migrations.RunPython(fill_search_name, migrations.RunPython.noop),
+        migrations.RunPython(recreate_title_fts, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,6 @@
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.db.models import UniqueConstraint
 from users.models import User
 
@@ -10,6 +10,12 @@ TEXT_LIMIT = 15
 LEN_VIEW_REW_COM = 10
 
 
+def empty_score_counts():
+    """Гистограмма оценок: количество отзывов для каждой оценки
+    от MIN_SCORE до MAX_SCORE."""
+    return [0] * (settings.MAX_SCORE - settings.MIN_SCORE + 1)
+
+
 class Genre(models.Model):
     name = models.CharField(
         'Наименование жанра',
@@ -20,6 +26,13 @@ class Genre(models.Model):
         unique=True,
         verbose_name='сл_Жанр',
     )
+    search_name = models.CharField(
+        'Ключ поиска',
+        max_length=256,
+        db_index=True,
+        editable=False,
+        default='',
+    )
 
     class Meta:
         verbose_name = 'Жанр'
@@ -39,6 +52,13 @@ class Category(models.Model):
         unique=True,
         verbose_name='сл_Категория',
     )
+    search_name = models.CharField(
+        'Ключ поиска',
+        max_length=256,
+        db_index=True,
+        editable=False,
+        default='',
+    )
 
     class Meta:
         verbose_name = 'Категория'
@@ -76,8 +96,59 @@ class Title(models.Model):
         max_length=100,
         blank=True,
     )
+    search_name = models.CharField(
+        'Ключ поиска',
+        max_length=256,
+        db_index=True,
+        editable=False,
+        default='',
+    )
+    rating_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    review_count = models.PositiveIntegerField(
+        'Количество отзывов',
+        default=0,
+        editable=False,
+    )
+    rating = models.FloatField(
+        'Рейтинг',
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    score_counts = models.JSONField(
+        'Распределение оценок',
+        default=empty_score_counts,
+        editable=False,
+    )
+    weighted_rating = models.FloatField(
+        'Взвешенный рейтинг',
+        null=True,
+        blank=True,
+        editable=False,
+    )
 
     class Meta:
+        indexes = [
+            models.Index(
+                fields=['-weighted_rating', 'name'],
+                name='title_weighted_rating_idx',
+            ),
+            models.Index(fields=['name'], name='title_name_idx'),
+            models.Index(fields=['year'], name='title_year_idx'),
+            models.Index(fields=['rating'], name='title_rating_idx'),
+            models.Index(
+                fields=['review_count'],
+                name='title_review_count_idx',
+            ),
+            models.Index(
+                fields=['category', 'name'],
+                name='title_category_name_idx',
+            ),
+        ]
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
 
@@ -117,12 +188,31 @@ class Review(models.Model):
     def __str__(self):
         return self.text[:LEN_VIEW_REW_COM:]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_score = instance.__dict__.get('score')
+        instance._loaded_title_id = instance.__dict__.get('title_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Отзыв и счётчики рейтинга произведения (см. reviews.signals)
+        # должны попасть в БД одной транзакцией.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     class Meta:
         constraints = [
             UniqueConstraint(
                 name='unique_score_for_title', fields=['author', 'title']
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx',
+            ),
+        ]
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
 
@@ -147,6 +237,12 @@ class Comment(models.Model):
     )
 
     class Meta:
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx',
+            ),
+        ]
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
 
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, FloatField, Sum
+from django.db.models.functions import Cast
+
+from .models import Title
+from .versions import bump_version
+
+MEAN_RATING_CACHE_KEY = 'reviews:mean_rating'
+
+
+def calculate_mean_rating():
+    stats = Title.objects.aggregate(
+        rating_sum=Sum('rating_sum'),
+        review_count=Sum('review_count'),
+    )
+    if not stats['review_count']:
+        return (settings.MIN_SCORE + settings.MAX_SCORE) / 2
+    return stats['rating_sum'] / stats['review_count']
+
+
+def get_mean_rating():
+    """Средняя оценка по всем отзывам сайта, кэшируется на
+    RATING_MEAN_TIMEOUT секунд."""
+    return cache.get_or_set(
+        MEAN_RATING_CACHE_KEY,
+        calculate_mean_rating,
+        settings.RATING_MEAN_TIMEOUT,
+    )
+
+
+def weighted_rating(rating_sum, review_count, mean_rating=None):
+    """Байесовский рейтинг: оценки произведения дополняются
+    RATING_MIN_VOTES оценками, равными средней по сайту."""
+    if not review_count:
+        return None
+    if mean_rating is None:
+        mean_rating = get_mean_rating()
+    min_votes = settings.RATING_MIN_VOTES
+    return (rating_sum + min_votes * mean_rating) / (review_count + min_votes)
+
+
+def refresh_weighted_ratings():
+    """Пересчитывает взвешенный рейтинг всех произведений одним UPDATE
+    по свежей средней оценке."""
+    mean_rating = calculate_mean_rating()
+    cache.set(
+        MEAN_RATING_CACHE_KEY, mean_rating, settings.RATING_MEAN_TIMEOUT
+    )
+    min_votes = settings.RATING_MIN_VOTES
+    Title.objects.filter(review_count=0).update(weighted_rating=None)
+    updated = Title.objects.filter(review_count__gt=0).update(
+        weighted_rating=(
+            Cast(F('rating_sum'), FloatField()) + min_votes * mean_rating
+        ) / (F('review_count') + min_votes)
+    )
+    # Порядок /titles/top/ мог измениться.
+    bump_version('titles', 'list')
+    return updated
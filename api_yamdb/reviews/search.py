@@ -0,0 +1,97 @@
+import re
+
+from django.db import connection
+
+
+def normalize_search_key(text):
+    """Ключ для поиска без учёта регистра: casefold, ё -> е,
+    пробельные символы схлопываются в один пробел."""
+    return ' '.join(text.casefold().replace('ё', 'е').split())
+
+
+def filter_name_prefix(queryset, text):
+    """Поиск по началу названия как диапазон по индексированному
+    search_name: key <= search_name < key с увеличенным последним
+    символом."""
+    key = normalize_search_key(text)
+    if not key:
+        return queryset
+    upper = key[:-1] + chr(min(ord(key[-1]) + 1, 0x10FFFF))
+    return queryset.filter(search_name__gte=key, search_name__lt=upper)
+
+
+def fts_table(model):
+    return f'{model._meta.db_table}_fts'
+
+
+def fts_statements(model, columns):
+    """SQL для FTS5-индекса с внешним содержимым по колонкам модели и
+    триггеров, которые синхронизируют индекс при любой записи в таблицу.
+    Возвращает пару (create, drop)."""
+    table = model._meta.db_table
+    fts = fts_table(model)
+    names = ', '.join(columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    insert = (
+        f'INSERT INTO "{fts}"(rowid, {names}) VALUES (new.id, {new_values});'
+    )
+    delete = (
+        f'INSERT INTO "{fts}"("{fts}", rowid, {names}) '
+        f'VALUES (\'delete\', old.id, {old_values});'
+    )
+    create = (
+        f'CREATE VIRTUAL TABLE "{fts}" USING fts5({names}, '
+        f'content="{table}", content_rowid="id", '
+        'tokenize="unicode61 remove_diacritics 2")',
+        f'CREATE TRIGGER "{fts}_insert" AFTER INSERT ON "{table}" '
+        f'BEGIN {insert} END',
+        f'CREATE TRIGGER "{fts}_delete" AFTER DELETE ON "{table}" '
+        f'BEGIN {delete} END',
+        f'CREATE TRIGGER "{fts}_update" AFTER UPDATE OF {names} '
+        f'ON "{table}" BEGIN {delete} {insert} END',
+        f'INSERT INTO "{fts}"("{fts}") VALUES (\'rebuild\')',
+    )
+    drop = (
+        f'DROP TRIGGER IF EXISTS "{fts}_insert"',
+        f'DROP TRIGGER IF EXISTS "{fts}_delete"',
+        f'DROP TRIGGER IF EXISTS "{fts}_update"',
+        f'DROP TABLE IF EXISTS "{fts}"',
+    )
+    return create, drop
+
+
+def fts_query(text):
+    """Превращает пользовательский ввод в запрос FTS5: каждое слово
+    ищется как префикс, все слова обязательны. Кавычки экранируют
+    синтаксис FTS5 во вводе."""
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+
+
+def fts_search(queryset, text, fallback_field, rank=True):
+    """Полнотекстовый поиск по FTS5-индексу модели queryset. С rank=True
+    результаты упорядочены по релевантности (bm25). На СУБД без FTS5
+    ищет через icontains по fallback_field."""
+    query = fts_query(text)
+    if not query:
+        return queryset.none()
+    if connection.vendor != 'sqlite':
+        return queryset.filter(**{f'{fallback_field}__icontains': text})
+    table = queryset.model._meta.db_table
+    fts = fts_table(queryset.model)
+    queryset = queryset.extra(
+        tables=[fts],
+        where=[f'"{fts}"."rowid" = "{table}"."id"', f'"{fts}" MATCH %s'],
+        params=[query],
+    )
+    if rank:
+        queryset = queryset.extra(
+            select={'search_rank': f'bm25("{fts}")'},
+            order_by=['search_rank'],
+        )
+    return queryset
+
+
+def search_titles(queryset, text):
+    """Поиск по названию и описанию произведений."""
+    return fts_search(queryset, text, 'name')
@@ -0,0 +1,244 @@
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from users.models import User
+
+from .autocomplete import autocomplete_index, object_kind
+from .models import (
+    Category,
+    Comment,
+    Genre,
+    Review,
+    Title,
+    empty_score_counts,
+)
+from .ranking import weighted_rating
+from .search import normalize_search_key
+from .versions import bump_version
+
+# id произведений, которые удаляются в текущем потоке: каскадное
+# удаление их отзывов не пересчитывает рейтинг строки, которая сейчас
+# исчезнет. id убирается в post_delete произведения (или в post_save,
+# если удаление откатилось и произведение сохраняют снова).
+deleting_titles = threading.local()
+
+
+def titles_being_deleted():
+    if not hasattr(deleting_titles, 'ids'):
+        deleting_titles.ids = set()
+    return deleting_titles.ids
+
+
+def bump_on_commit(*parts):
+    transaction.on_commit(lambda: bump_version(*parts))
+
+
+def title_changed_on_commit(title_id):
+    """Сбрасывает кэш и ETag произведения и кэш списков произведений."""
+    bump_on_commit('title', title_id)
+    bump_on_commit('titles', 'list')
+
+
+def save_title_scores(title_id, rating_sum, review_count, score_counts):
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=rating_sum,
+        review_count=review_count,
+        rating=rating_sum / review_count if review_count else None,
+        weighted_rating=weighted_rating(rating_sum, review_count),
+        score_counts=score_counts,
+    )
+    title_changed_on_commit(title_id)
+
+
+def change_title_scores(title_id, added=None, removed=None):
+    """Инкрементально учитывает добавленную и/или удалённую оценку
+    в рейтинге и гистограмме оценок произведения."""
+    with transaction.atomic():
+        title = Title.objects.select_for_update().only(
+            'rating_sum', 'review_count', 'score_counts'
+        ).filter(pk=title_id).first()
+        if title is None:
+            return
+        score_counts = title.score_counts or empty_score_counts()
+        rating_sum, review_count = title.rating_sum, title.review_count
+        if added is not None:
+            score_counts[added - settings.MIN_SCORE] += 1
+            rating_sum += added
+            review_count += 1
+        if removed is not None:
+            score_counts[removed - settings.MIN_SCORE] -= 1
+            rating_sum -= removed
+            review_count -= 1
+        save_title_scores(title_id, rating_sum, review_count, score_counts)
+
+
+def recalculate_title_scores(title_id):
+    """Полностью пересчитывает рейтинг и гистограмму оценок произведения
+    по его отзывам."""
+    score_counts = empty_score_counts()
+    rows = Review.objects.filter(title_id=title_id).values(
+        'score'
+    ).annotate(count=Count('id')).order_by()
+    for row in rows:
+        score_counts[row['score'] - settings.MIN_SCORE] = row['count']
+    rating_sum = sum(
+        count * score
+        for score, count in enumerate(score_counts, settings.MIN_SCORE)
+    )
+    save_title_scores(title_id, rating_sum, sum(score_counts), score_counts)
+
+
+def review_moved(instance, loaded_title_id, loaded_score):
+    """Отзыв перенесён в другое произведение (например, в админке):
+    оценка уходит из рейтинга прежнего произведения и добавляется к
+    новому."""
+    if loaded_score is None:
+        recalculate_title_scores(loaded_title_id)
+        recalculate_title_scores(instance.title_id)
+    else:
+        change_title_scores(loaded_title_id, removed=loaded_score)
+        change_title_scores(instance.title_id, added=int(instance.score))
+    # review_changed видит только новое произведение.
+    bump_on_commit('reviews', loaded_title_id)
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    score = int(instance.score)
+    loaded_score = getattr(instance, '_loaded_score', None)
+    loaded_title_id = getattr(instance, '_loaded_title_id', None)
+    if created:
+        change_title_scores(instance.title_id, added=score)
+    elif loaded_title_id not in (None, instance.title_id):
+        review_moved(instance, loaded_title_id, loaded_score)
+    elif loaded_score is None:
+        recalculate_title_scores(instance.title_id)
+    elif score != loaded_score:
+        change_title_scores(
+            instance.title_id, added=score, removed=loaded_score
+        )
+    instance._loaded_score = score
+    instance._loaded_title_id = instance.title_id
+
+
+@receiver(pre_delete, sender=Title)
+def title_deleting(sender, instance, **kwargs):
+    titles_being_deleted().add(instance.pk)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    if instance.title_id in titles_being_deleted():
+        return
+    change_title_scores(instance.title_id, removed=int(instance.score))
+
+
+@receiver(pre_save, sender=Title)
+@receiver(pre_save, sender=Genre)
+@receiver(pre_save, sender=Category)
+def fill_search_name(sender, instance, **kwargs):
+    instance.search_name = normalize_search_key(instance.name)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+def catalog_saved(sender, instance, **kwargs):
+    transaction.on_commit(lambda: autocomplete_index.update(instance))
+
+
+@receiver(post_delete, sender=Title)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def catalog_deleted(sender, instance, **kwargs):
+    # После удаления Django обнуляет pk, поэтому он запоминается сразу.
+    kind, pk = object_kind(instance), instance.pk
+    transaction.on_commit(lambda: autocomplete_index.remove(kind, pk))
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Genre)
+@receiver(post_delete, sender=Category)
+def slug_list_changed(sender, instance, **kwargs):
+    # Сбрасывает кэш списков /genres/ и /categories/ (api.caching), а
+    # также списков произведений, в которые они вложены.
+    bump_on_commit(object_kind(instance), 'list')
+    bump_on_commit('titles', 'list')
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_changed(sender, instance, **kwargs):
+    titles_being_deleted().discard(instance.pk)
+    title_changed_on_commit(instance.pk)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if not reverse:
+        title_ids = [instance.pk] if action.startswith('post_') else []
+    elif action in ('post_add', 'post_remove'):
+        title_ids = pk_set
+    elif action == 'pre_clear':
+        # После очистки со стороны жанра уже не узнать, чьи это были
+        # произведения.
+        title_ids = list(instance.titles.values_list('id', flat=True))
+    else:
+        title_ids = []
+    for title_id in title_ids:
+        title_changed_on_commit(title_id)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    bump_on_commit('reviews', instance.title_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    bump_on_commit('comments', instance.review_id)
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None or (
+        update_fields is not None and 'username' not in update_fields
+    ):
+        instance._renamed = False
+        return
+    old = sender.objects.filter(pk=instance.pk).values_list(
+        'username', flat=True
+    ).first()
+    instance._renamed = old is not None and old != instance.username
+
+
+@receiver(post_save, sender=User)
+def author_renamed(sender, instance, **kwargs):
+    # Имя автора входит в ответы отзывов и комментариев, поэтому их
+    # ETag (api.caching) меняется вместе с ним.
+    if not getattr(instance, '_renamed', False):
+        return
+    title_ids = Review.objects.filter(author=instance).values_list(
+        'title_id', flat=True
+    ).distinct()
+    for title_id in title_ids:
+        bump_on_commit('reviews', title_id)
+    review_ids = Comment.objects.filter(author=instance).values_list(
+        'review_id', flat=True
+    ).distinct()
+    for review_id in review_ids:
+        bump_on_commit('comments', review_id)
@@ -0,0 +1,41 @@
+"""Счётчики версий данных в кэше Django.
+
+Закэшированные ответы хранятся под ключом с текущей версией, поэтому
+для сброса кэша достаточно увеличить версию: старые ключи больше не
+читаются и вытесняются по таймауту. Начальное значение — время в
+наносекундах, чтобы версия, вытесненная из кэша, не повторилась.
+Между процессами версии видны только при общем кэше (Redis, Memcached).
+"""
+import time
+
+from django.core.cache import cache
+
+
+def version_key(*parts):
+    return 'version:' + ':'.join(str(part) for part in parts)
+
+
+def get_version(*parts):
+    return cache.get_or_set(version_key(*parts), time.time_ns, None)
+
+
+def get_versions(*names):
+    """Версии нескольких счётчиков, например ('title', 1) и
+    ('genres', 'list'), за одно обращение к кэшу, если все они есть."""
+    keys = [version_key(*parts) for parts in names]
+    versions = cache.get_many(keys)
+    return [
+        versions[key] if key in versions
+        else cache.get_or_set(key, time.time_ns, None)
+        for key in keys
+    ]
+
+
+def bump_version(*parts):
+    key = version_key(*parts)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(key, version, None)
+        return version
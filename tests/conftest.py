@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -32,4 +33,22 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 
 pytest_plugins = [
     'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_data',
+    'tests.fixtures.fixture_report',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Тестовая БД очищается без сигналов, поэтому версии и ответы
+    # в кэше Django сбрасываются перед каждым тестом.
+    from django.core.cache import cache
+
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_title_lists(settings):
+    # Тесты ожидают, что запись сразу видна в /titles/. Устаревшие
+    # страницы (stale-while-revalidate) проверяются в test_24.
+    settings.LIST_MAX_STALE = 0
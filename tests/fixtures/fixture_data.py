@@ -0,0 +1,66 @@
+import pytest
+
+
+@pytest.fixture
+def populate_catalog(django_user_model):
+    """Быстро наполняет БД через bulk_create: `size` пользователей,
+    жанров, категорий, произведений, отзывов к первому произведению и
+    комментариев к первому отзыву."""
+    from reviews.models import Category, Comment, Genre, Review, Title
+    from reviews.signals import recalculate_title_scores
+
+    def populate(size):
+        # SQLite не возвращает id из bulk_create, поэтому объекты
+        # перечитываются из БД.
+        django_user_model.objects.bulk_create(
+            django_user_model(
+                username=f'reader{idx}', email=f'reader{idx}@yamdb.fake'
+            )
+            for idx in range(size)
+        )
+        Category.objects.bulk_create(
+            Category(
+                name=f'Категория {idx}', slug=f'category-{idx}',
+                search_name=f'категория {idx}',
+            )
+            for idx in range(size)
+        )
+        Genre.objects.bulk_create(
+            Genre(
+                name=f'Жанр {idx}', slug=f'genre-{idx}',
+                search_name=f'жанр {idx}',
+            )
+            for idx in range(size)
+        )
+        Title.objects.bulk_create(
+            Title(
+                name=f'Произведение {idx}', year=2000, category=category,
+                search_name=f'произведение {idx}',
+            )
+            for idx, category in enumerate(Category.objects.order_by('id'))
+        )
+        titles = list(Title.objects.order_by('id'))
+        genres = list(Genre.objects.order_by('id')[:3])
+        Title.genre.through.objects.bulk_create(
+            Title.genre.through(title=title, genre=genre)
+            for title in titles
+            for genre in genres
+        )
+        authors = django_user_model.objects.filter(
+            username__startswith='reader'
+        ).order_by('id')
+        Review.objects.bulk_create(
+            Review(text=f'Отзыв {idx}', score=5, author=author,
+                   title=titles[0])
+            for idx, author in enumerate(authors)
+        )
+        # bulk_create не отправляет сигналы, рейтинг пересчитывается явно.
+        recalculate_title_scores(titles[0].id)
+        review = Review.objects.order_by('id').first()
+        Comment.objects.bulk_create(
+            Comment(text=f'Комментарий {idx}', author=author, review=review)
+            for idx, author in enumerate(authors)
+        )
+        return {'title_id': titles[0].id, 'review_id': review.id}
+
+    return populate
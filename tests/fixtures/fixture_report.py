@@ -0,0 +1,17 @@
+import json
+import os
+
+import pytest
+
+
+@pytest.fixture(scope='module')
+def benchmark_report(request):
+    """Замеры модуля тестов. Если задана переменная окружения с именем
+    из REPORT_ENV модуля, отчёт в формате JSON записывается в файл из
+    этой переменной."""
+    report = {}
+    yield report
+    path = os.environ.get(getattr(request.module, 'REPORT_ENV', ''))
+    if path:
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
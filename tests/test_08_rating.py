@@ -0,0 +1,195 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def check_title_rating(self, title_id, rating_sum, review_count, rating):
+        from reviews.models import Title
+
+        title = Title.objects.get(pk=title_id)
+        assert title.rating_sum == rating_sum, (
+            'Проверьте, что поле `rating_sum` произведения пересчитывается '
+            'при изменении отзывов.'
+        )
+        assert title.review_count == review_count, (
+            'Проверьте, что поле `review_count` произведения пересчитывается '
+            'при изменении отзывов.'
+        )
+        assert title.rating == rating, (
+            'Проверьте, что поле `rating` произведения пересчитывается '
+            'при изменении отзывов.'
+        )
+
+    def test_01_rating_maintained_on_review_writes(self, admin_client,
+                                                   admin, user_client, user,
+                                                   moderator_client,
+                                                   moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_id = titles[0]['id']
+        self.check_title_rating(title_id, 15, 3, 5.0)
+        self.check_title_rating(titles[1]['id'], 0, 0, None)
+
+        url = f'/api/v1/titles/{title_id}/reviews/{reviews[1]["id"]}/'
+        response = user_client.patch(url, data={'score': 8})
+        assert response.status_code == HTTPStatus.OK
+        self.check_title_rating(title_id, 18, 3, 6.0)
+
+        response = user_client.delete(url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        self.check_title_rating(title_id, 10, 2, 5.0)
+
+        moderator.delete()
+        self.check_title_rating(title_id, 5, 1, 5.0)
+
+        admin_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/'
+        )
+        self.check_title_rating(title_id, 0, 0, None)
+
+    def test_02_rating_read_without_aggregation(self, admin_client,
+                                                user_client):
+        _, titles = create_reviews(admin_client, {})
+        create_single_review(user_client, titles[0]['id'], 'Отлично', 9)
+        create_single_review(admin_client, titles[0]['id'], 'Хорошо', 6)
+
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = admin_client.get(url)
+        assert response.json().get('rating') == 8, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает округлённый '
+            'средний рейтинг произведения.'
+        )
+        with CaptureQueriesContext(connection) as context:
+            admin_client.get('/api/v1/titles/')
+        sql = ' '.join(query['sql'] for query in context.captured_queries)
+        assert 'AVG(' not in sql.upper(), (
+            'Проверьте, что список произведений не агрегирует отзывы во '
+            'время запроса, а читает сохранённый рейтинг.'
+        )
+
+    def test_03_title_list_queries_do_not_grow(self, admin_client, client):
+        titles, categories, genres = create_titles(admin_client)
+
+        def count_queries():
+            with CaptureQueriesContext(connection) as context:
+                response = client.get('/api/v1/titles/')
+            assert response.status_code == HTTPStatus.OK
+            return len(context.captured_queries)
+
+        queries_for_two = count_queries()
+        for idx in range(5):
+            admin_client.post('/api/v1/titles/', data={
+                'name': f'Произведение {idx}',
+                'year': 2000,
+                'genre': [genre['slug'] for genre in genres],
+                'category': categories[0]['slug'],
+            })
+        assert count_queries() == queries_for_two, (
+            'Проверьте, что количество SQL-запросов к `/api/v1/titles/` не '
+            'зависит от количества произведений на странице.'
+        )
+
+    def test_04_rating_distribution(self, client, admin_client, admin,
+                                    user_client, user, moderator_client):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Хорошо', 8)
+        create_single_review(moderator_client, title_id, 'Отлично', 10)
+        url = f'/api/v1/titles/{title_id}/rating-distribution/'
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        data = response.json()
+        expected_counts = {str(score): 0 for score in range(1, 11)}
+        expected_counts.update({'5': 1, '8': 1, '10': 1})
+        assert data['counts'] == expected_counts, (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'количество отзывов для каждой оценки.'
+        )
+        assert data['mean'] == 7.67
+        assert data['median'] == 8
+
+        user.delete()
+        data = client.get(url).json()
+        assert data['counts']['8'] == 0, (
+            'Проверьте, что гистограмма оценок обновляется при удалении '
+            'отзывов.'
+        )
+        assert data['median'] == 7.5
+
+        response = client.get(
+            f'/api/v1/titles/{titles[1]["id"]}/rating-distribution/'
+        )
+        assert response.json()['median'] is None
+        response = client.get('/api/v1/titles/999/rating-distribution/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_05_title_delete_skips_rating_updates(self, admin_client,
+                                                  user_client,
+                                                  populate_catalog):
+        from reviews.models import Title
+
+        title_id = populate_catalog(30)['title_id']
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.delete(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        updates = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('UPDATE "reviews_title"')
+        ]
+        assert not updates, (
+            'Проверьте, что при удалении произведения рейтинг не '
+            'пересчитывается для каждого удаляемого отзыва.'
+        )
+        other = Title.objects.order_by('id').first()
+        review = create_single_review(user_client, other.id, 'Отзыв', 4)
+        user_client.delete(
+            f'/api/v1/titles/{other.id}/reviews/{review.json()["id"]}/'
+        )
+        self.check_title_rating(other.id, 0, 0, None)
+
+    def test_06_review_moved_between_titles(self, admin_client, client,
+                                            user_client):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        title_a, title_b = titles[0]['id'], titles[1]['id']
+        review_id = create_single_review(
+            user_client, title_a, 'Отзыв', 8
+        ).json()['id']
+        reviews_url = f'/api/v1/titles/{title_a}/reviews/'
+        etag = client.get(reviews_url)['ETag']
+
+        review = Review.objects.get(pk=review_id)
+        review.title_id = title_b
+        review.save()
+        self.check_title_rating(title_a, 0, 0, None)
+        self.check_title_rating(title_b, 8, 1, 8.0)
+        for title_id, count in ((title_a, 0), (title_b, 1)):
+            counts = client.get(
+                f'/api/v1/titles/{title_id}/rating-distribution/'
+            ).json()['counts']
+            assert counts['8'] == count and sum(counts.values()) == count, (
+                'Проверьте, что при переносе отзыва гистограмма оценок '
+                'пересчитывается у обоих произведений.'
+            )
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что перенос отзыва меняет ETag отзывов прежнего '
+            'произведения.'
+        )
+        assert response.json()['results'] == []
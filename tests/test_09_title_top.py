@@ -0,0 +1,74 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleTopAPI:
+
+    def create_scores(self, django_user_model, title_id, scores, prefix):
+        from reviews.models import Review
+
+        for idx, score in enumerate(scores):
+            author = django_user_model.objects.create_user(
+                username=f'{prefix}{idx}', email=f'{prefix}{idx}@yamdb.fake'
+            )
+            Review.objects.create(
+                text='Отзыв', score=score, author=author, title_id=title_id
+            )
+
+    def test_01_top_uses_weighted_rating(self, client, admin_client,
+                                         django_user_model):
+        from reviews.models import Title
+        from reviews.ranking import refresh_weighted_ratings
+
+        titles, _, genres = create_titles(admin_client)
+        bad_title = Title.objects.create(name='Провал', year=2000)
+        self.create_scores(django_user_model, titles[0]['id'], [10], 'one')
+        self.create_scores(
+            django_user_model, titles[1]['id'], [9] * 30, 'many'
+        )
+        self.create_scores(django_user_model, bad_title.id, [2] * 30, 'bad')
+        refresh_weighted_ratings()
+        url = '/api/v1/titles/top/'
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        results = response.json()['results']
+        assert [title['id'] for title in results] == [
+            titles[1]['id'], titles[0]['id'], bad_title.id
+        ], (
+            f'Проверьте, что `{url}` упорядочивает произведения по '
+            'взвешенному рейтингу: единственная оценка 10 не должна '
+            'опережать множество оценок 9.'
+        )
+        assert results[0]['rating'] == 9
+
+        response = client.get(url, {'genre': genres[0]['slug']})
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[0]['id']
+        ], (
+            f'Проверьте, что `{url}` поддерживает фильтрацию по жанру.'
+        )
+
+        for ordering in ('name', '-year', 'rating'):
+            response = client.get(url, {'ordering': ordering})
+            assert [title['id'] for title in response.json()['results']] == [
+                titles[1]['id'], titles[0]['id'], bad_title.id
+            ], (
+                f'Проверьте, что `{url}?ordering=` не меняет порядок по '
+                'взвешенному рейтингу.'
+            )
+
+    def test_02_top_skips_titles_without_reviews(self, client,
+                                                 admin_client):
+        create_titles(admin_client)
+        response = client.get('/api/v1/titles/top/')
+        assert response.json()['count'] == 0, (
+            'Проверьте, что в рейтинг не попадают произведения без отзывов.'
+        )
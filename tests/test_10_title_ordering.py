@@ -0,0 +1,116 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, explain_query_plan
+
+ORDERING_INDEXES = (
+    ('name', 'title_name_idx'),
+    ('-name', 'title_name_idx'),
+    ('year', 'title_year_idx'),
+    ('-year', 'title_year_idx'),
+    ('rating', 'title_rating_idx'),
+    ('-rating', 'title_rating_idx'),
+    ('review_count', 'title_review_count_idx'),
+    ('-review_count', 'title_review_count_idx'),
+)
+RANGE_FILTERS = (
+    {'year_min': 1980, 'year_max': 2000},
+    {'rating_min': 3, 'rating_max': 8},
+    {'year_min': 1980, 'ordering': 'year'},
+    {'rating_min': 3, 'ordering': '-rating'},
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10TitleOrderingAPI:
+    url = '/api/v1/titles/'
+
+    def get_ids(self, client, params):
+        response = client.get(self.url, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}` с параметрами '
+            f'{params} возвращает ответ со статусом 200.'
+        )
+        return [title['id'] for title in response.json()['results']]
+
+    def test_01_ordering(self, client, admin_client, admin, user,
+                         user_client):
+        _, titles = create_reviews(
+            admin_client, {admin: admin_client, user: user_client}
+        )
+        terminator, die_hard = titles[0]['id'], titles[1]['id']
+
+        assert self.get_ids(client, {}) == [die_hard, terminator]
+        assert self.get_ids(client, {'ordering': '-name'}) == [
+            terminator, die_hard
+        ]
+        assert self.get_ids(client, {'ordering': '-year'}) == [
+            die_hard, terminator
+        ]
+        assert self.get_ids(client, {'ordering': '-review_count'}) == [
+            terminator, die_hard
+        ], (
+            f'Проверьте, что `{self.url}` поддерживает сортировку по '
+            'количеству отзывов.'
+        )
+        assert self.get_ids(client, {'ordering': '-rating'})[0] == terminator
+
+    def test_02_range_filters(self, client, admin_client, admin):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        terminator, die_hard = titles[0]['id'], titles[1]['id']
+
+        assert self.get_ids(client, {'year_min': 1985}) == [die_hard]
+        assert self.get_ids(client, {'year_max': 1985}) == [terminator]
+        assert self.get_ids(
+            client, {'year_min': 1980, 'year_max': 1990}
+        ) == [die_hard, terminator]
+        assert self.get_ids(client, {'rating_min': 5}) == [terminator], (
+            f'Проверьте, что `{self.url}` поддерживает фильтрацию по '
+            'минимальному рейтингу.'
+        )
+        assert self.get_ids(client, {'rating_max': 4}) == []
+
+    @pytest.mark.parametrize('ordering,index', ORDERING_INDEXES)
+    def test_03_ordering_uses_index(self, ordering, index):
+        from api.filter import FilterTitle
+        from reviews.models import Title
+
+        queryset = FilterTitle(
+            {'ordering': ordering},
+            queryset=Title.objects.select_related('category'),
+        ).qs[:10]
+        plan = explain_query_plan(queryset)
+        assert f'SCAN reviews_title USING INDEX {index}' in plan, (
+            f'Сортировка `{ordering}` должна использовать индекс `{index}`. '
+            f'План запроса: {plan}'
+        )
+        assert not any('TEMP B-TREE' in step for step in plan), (
+            f'Сортировка `{ordering}` не должна требовать отдельной '
+            f'сортировки. План запроса: {plan}'
+        )
+
+    @pytest.mark.parametrize('params', RANGE_FILTERS)
+    def test_04_range_filters_use_index(self, params):
+        from api.filter import FilterTitle
+        from reviews.models import Title
+
+        queryset = FilterTitle(
+            params,
+            queryset=Title.objects.select_related('category').order_by(
+                'name'
+            ),
+        ).qs[:10]
+        plan = explain_query_plan(queryset)
+        assert any(
+            step.startswith('SEARCH reviews_title USING INDEX')
+            for step in plan
+        ), (
+            f'Фильтр {params} должен использовать индекс. '
+            f'План запроса: {plan}'
+        )
+        assert 'SCAN reviews_title' not in plan, (
+            f'Фильтр {params} не должен просматривать всю таблицу. '
+            f'План запроса: {plan}'
+        )
+
@@ -0,0 +1,88 @@
+"""Бюджет SQL-запросов для списков API.
+
+Для каждого эндпоинта из api/urls.py считается количество запросов к БД
+при выдаче страниц из 1, 10 и 100 объектов. Количество не должно расти
+вместе с размером страницы (N+1). Если задана переменная окружения
+QUERY_BUDGET_REPORT, отчёт в формате JSON записывается в этот файл.
+"""
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import measure_get
+
+REPORT_ENV = 'QUERY_BUDGET_REPORT'
+PAGE_SIZES = (1, 10, 100)
+ENDPOINTS = (
+    '/api/v1/users/',
+    '/api/v1/genres/',
+    '/api/v1/categories/',
+    '/api/v1/titles/',
+    '/api/v1/titles/top/',
+    '/api/v1/titles/{title_id}/reviews/',
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+    '/api/v1/search/reviews/?q=отзыв',
+    '/api/v1/search/comments/?q=комментарий',
+)
+
+
+def count_title_lookups(context):
+    # Пересчёт рейтинга в reviews.signals читает только счётчики, а
+    # получение произведения из URL загружает строку целиком.
+    return len([
+        query for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and '"reviews_title"."description"' in query['sql']
+    ])
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11QueryBudget:
+
+    @pytest.mark.parametrize('endpoint', ENDPOINTS)
+    def test_01_queries_do_not_grow_with_page_size(self, endpoint,
+                                                   admin_client,
+                                                   populate_catalog,
+                                                   benchmark_report):
+        from reviews.ranking import refresh_weighted_ratings
+
+        ids = populate_catalog(max(PAGE_SIZES))
+        refresh_weighted_ratings()
+        url = endpoint.format(**ids)
+        results = {
+            size: measure_get(admin_client, url, limit=size)[1]
+            for size in PAGE_SIZES
+        }
+        benchmark_report[endpoint] = results
+        counts = {size: result['queries'] for size, result in results.items()}
+        assert len(set(counts.values())) == 1, (
+            f'Количество SQL-запросов к `{endpoint}` растёт вместе с '
+            f'размером страницы: {counts}. Проверьте, что связанные объекты '
+            'загружаются через select_related/prefetch_related.'
+        )
+
+    def test_02_parent_resolved_once_per_request(self, admin_client,
+                                                 user_client,
+                                                 populate_catalog):
+        ids = populate_catalog(1)
+        url = f'/api/v1/titles/{ids["title_id"]}/reviews/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, {'text': 'Текст', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        title_lookups = count_title_lookups(context)
+        assert title_lookups == 1, (
+            f'Проверьте, что POST-запрос к `{url}` получает произведение '
+            f'из БД одним запросом. Сейчас запросов: {title_lookups}.'
+        )
+
+        review_url = f'{url}{response.json()["id"]}/'
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.patch(review_url, {'score': 8})
+        assert response.status_code == HTTPStatus.OK
+        title_lookups = count_title_lookups(context)
+        assert title_lookups == 1, (
+            f'Проверьте, что PATCH-запрос к `{review_url}` получает '
+            'произведение из БД одним запросом.'
+        )
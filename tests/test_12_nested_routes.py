@@ -0,0 +1,45 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12NestedRoutes:
+
+    def test_01_comments_of_review_from_other_title(self, admin_client,
+                                                    admin, user_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        other_review = create_single_review(
+            user_client, titles[1]['id'], 'Другой отзыв', 3
+        ).json()
+        url = (
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}'
+            '/comments/'
+        )
+
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что GET-запрос к '
+            '`/api/v1/titles/{title_id}/reviews/{review_id}/comments/` '
+            'возвращает 404, если отзыв относится к другому произведению.'
+        )
+        response = admin_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что POST-запрос к '
+            '`/api/v1/titles/{title_id}/reviews/{review_id}/comments/` '
+            'возвращает 404, если отзыв относится к другому произведению.'
+        )
+        response = admin_client.get(
+            f'{url}{comments[0]["id"]}/'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+        response = admin_client.get(
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{other_review["id"]}'
+            '/comments/'
+        )
+        assert response.status_code == HTTPStatus.OK
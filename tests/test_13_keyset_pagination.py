@@ -0,0 +1,110 @@
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from tests.utils import explain_query_plan
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13KeysetPagination:
+
+    def walk(self, client, url, params):
+        pages = []
+        response = client.get(url, params)
+        while True:
+            assert response.status_code == HTTPStatus.OK, (
+                f'Проверьте, что GET-запрос к `{url}` с курсором '
+                'возвращает ответ со статусом 200.'
+            )
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что keyset-пагинация не считает общее '
+                'количество объектов.'
+            )
+            pages.append(data)
+            if not data['next']:
+                return pages
+            response = client.get(data['next'])
+
+    def test_01_comments_with_equal_pub_date(self, client,
+                                             populate_catalog):
+        from reviews.models import Comment
+
+        ids = populate_catalog(25)
+        Comment.objects.update(pub_date=timezone.now())
+        url = (
+            f'/api/v1/titles/{ids["title_id"]}/reviews/{ids["review_id"]}'
+            '/comments/'
+        )
+        pages = self.walk(client, url, {'pagination': 'cursor', 'limit': 10})
+        assert [len(page['results']) for page in pages] == [10, 10, 5]
+        walked = [
+            comment['id'] for page in pages for comment in page['results']
+        ]
+        assert walked == list(
+            Comment.objects.order_by('pub_date', 'id').values_list(
+                'id', flat=True
+            )
+        ), (
+            f'Проверьте, что курсорная пагинация `{url}` выдаёт все '
+            'комментарии по одному разу в порядке (pub_date, id).'
+        )
+
+        previous = client.get(pages[2]['previous']).json()
+        assert previous['results'] == pages[1]['results'], (
+            'Проверьте, что ссылка `previous` курсорной пагинации ведёт '
+            'на предыдущую страницу.'
+        )
+
+    def test_02_titles_and_reviews(self, client, populate_catalog):
+        from reviews.models import Review, Title
+
+        ids = populate_catalog(12)
+        pages = self.walk(
+            client, '/api/v1/titles/', {'pagination': 'cursor', 'limit': 5}
+        )
+        assert [
+            title['id'] for page in pages for title in page['results']
+        ] == list(
+            Title.objects.order_by('name', 'id').values_list('id', flat=True)
+        )
+
+        url = f'/api/v1/titles/{ids["title_id"]}/reviews/'
+        pages = self.walk(client, url, {'pagination': 'cursor', 'limit': 5})
+        assert len(
+            [review for page in pages for review in page['results']]
+        ) == Review.objects.count()
+
+        response = client.get('/api/v1/titles/', {'limit': 5})
+        assert response.json()['count'] == 12, (
+            'Проверьте, что без параметра `pagination=cursor` используется '
+            'пагинация limit/offset.'
+        )
+
+    def test_03_invalid_cursor(self, client, populate_catalog):
+        populate_catalog(1)
+        response = client.get('/api/v1/titles/', {'cursor': 'broken'})
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_keyset_queries_use_index(self, populate_catalog):
+        from api.pagination import KeysetPagination
+        from reviews.models import Comment
+
+        ids = populate_catalog(3)
+        ordering = ('pub_date', 'id')
+        paginator = KeysetPagination()
+        position = paginator._get_position_from_instance(
+            Comment.objects.first(), ordering
+        )
+        queryset = paginator.filter_after(
+            Comment.objects.filter(review_id=ids['review_id']),
+            ordering,
+            position,
+        ).order_by(*ordering)[:11]
+        plan = explain_query_plan(queryset)
+        assert any('comment_review_pub_date_idx' in step for step in plan), (
+            f'Запрос страницы комментариев должен использовать индекс. '
+            f'План запроса: {plan}'
+        )
+        assert not any('TEMP B-TREE' in step for step in plan)
@@ -0,0 +1,67 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14PaginationCount:
+    url = '/api/v1/titles/'
+
+    def get(self, client, params):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(self.url, params)
+        assert response.status_code == HTTPStatus.OK
+        counts = [
+            query for query in context.captured_queries
+            if 'COUNT(*)' in query['sql']
+        ]
+        return response.json(), len(counts)
+
+    def test_01_count_none(self, client, populate_catalog):
+        populate_catalog(12)
+        data, count_queries = self.get(client, {'count': 'none', 'limit': 5})
+        assert 'count' not in data and count_queries == 0, (
+            f'Проверьте, что `{self.url}?count=none` не выполняет '
+            'SELECT COUNT(*) и не возвращает `count`.'
+        )
+        assert len(data['results']) == 5
+        assert 'offset=5' in data['next']
+
+        data, _ = self.get(
+            client, {'count': 'none', 'limit': 5, 'offset': 10}
+        )
+        assert len(data['results']) == 2
+        assert data['next'] is None, (
+            'Проверьте, что на последней странице `next` равен None.'
+        )
+        assert 'offset=5' in data['previous']
+
+    def test_02_count_cached(self, client, populate_catalog):
+        from reviews.models import Title
+
+        cache.clear()
+        populate_catalog(12)
+        data, count_queries = self.get(client, {'count': 'cached'})
+        assert data['count'] == 12 and count_queries == 1
+
+        Title.objects.create(name='Новое произведение', year=2020)
+        data, count_queries = self.get(client, {'count': 'cached'})
+        assert count_queries == 0, (
+            f'Проверьте, что `{self.url}?count=cached` берёт `count` '
+            'из кэша.'
+        )
+        assert data['count'] == 12
+
+        data, count_queries = self.get(client, {'count': 'exact'})
+        assert data['count'] == 13 and count_queries == 1
+
+    def test_03_unsupported_mode_falls_back_to_exact(self, client,
+                                                     populate_catalog):
+        populate_catalog(3)
+        response = client.get('/api/v1/genres/', {'count': 'none'})
+        assert response.json()['count'] == 3
+        data, _ = self.get(client, {'count': 'unknown'})
+        assert data['count'] == 3
@@ -0,0 +1,113 @@
+"""EXPLAIN QUERY PLAN для всех запросов, которые API выполняет в типовом
+сценарии чтения и записи.
+
+Запрос считается плохим, если он просматривает таблицу целиком
+(`SCAN <таблица>` без индекса) или сортирует во временном B-дереве.
+Исключения: чтение первых строк таблицы без фильтра и сортировки
+(`SELECT ... LIMIT n`) останавливается после n строк, а фильтр по жанру
+через M2M-таблицу сортирует только произведения выбранного жанра.
+"""
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_comment, create_single_review
+
+FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+PLANNED_STATEMENTS = ('SELECT', 'INSERT', 'UPDATE', 'DELETE')
+
+
+def bad_plan_steps(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        plan = [row[-1] for row in cursor.fetchall()]
+    limited_stream = (
+        sql.startswith('SELECT') and ' LIMIT ' in sql
+        and ' WHERE ' not in sql and ' ORDER BY ' not in sql
+    )
+    genre_subset = 'JOIN "reviews_title_genre"' in sql
+    bad = []
+    for step in plan:
+        if FULL_SCAN.match(step) and not limited_stream:
+            bad.append(step)
+        if 'TEMP B-TREE' in step and not genre_subset:
+            bad.append(step)
+    return bad
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15QueryPlans:
+
+    def test_01_hot_queries_use_indexes(self, admin_client, user_client,
+                                        moderator, populate_catalog):
+        ids = populate_catalog(30)
+        title_id = ids['title_id']
+        titles_url = '/api/v1/titles/'
+        reviews_url = f'{titles_url}{title_id}/reviews/'
+        comments_url = f'{reviews_url}{ids["review_id"]}/comments/'
+
+        with CaptureQueriesContext(connection) as context:
+            for url in (
+                titles_url,
+                f'{titles_url}?genre=genre-1',
+                f'{titles_url}?category=category-1',
+                f'{titles_url}?year_min=1990&ordering=-rating',
+                f'{titles_url}?pagination=cursor',
+                f'{titles_url}?name_prefix=произведение 1',
+                f'{titles_url}top/',
+                f'{titles_url}{title_id}/',
+                f'{titles_url}{title_id}/rating-distribution/',
+                reviews_url,
+                f'{reviews_url}?pagination=cursor',
+                f'{reviews_url}{ids["review_id"]}/',
+                comments_url,
+                f'{comments_url}?pagination=cursor',
+                '/api/v1/genres/',
+                '/api/v1/genres/?name_prefix=жанр 1',
+                '/api/v1/categories/',
+                '/api/v1/categories/?name_prefix=Категория',
+                '/api/v1/users/',
+            ):
+                admin_client.get(url)
+            review = create_single_review(
+                user_client, title_id, 'Отзыв', 7
+            ).json()
+            user_client.patch(f'{reviews_url}{review["id"]}/', {'score': 9})
+            create_single_comment(
+                user_client, title_id, review['id'], 'Комментарий'
+            )
+            user_client.delete(f'{reviews_url}{review["id"]}/')
+            admin_client.delete('/api/v1/genres/genre-2/')
+            admin_client.delete(f'{titles_url}{title_id}/')
+            moderator.delete()
+
+        bad_queries = {}
+        for query in context.captured_queries:
+            sql = query['sql']
+            if not sql.startswith(PLANNED_STATEMENTS):
+                continue
+            bad = bad_plan_steps(sql)
+            if bad:
+                bad_queries[sql] = bad
+        assert not bad_queries, (
+            'Запросы API просматривают таблицу целиком или сортируют без '
+            'индекса. Добавьте индекс в миграции: '
+            f'{bad_queries}'
+        )
+
+    def test_02_genre_filter_uses_composite_index(self, populate_catalog):
+        from api.filter import FilterTitle
+        from reviews.models import Title
+
+        from tests.utils import explain_query_plan
+
+        populate_catalog(5)
+        queryset = FilterTitle(
+            {'genre': 'genre-1'}, queryset=Title.objects.all()
+        ).qs
+        plan = explain_query_plan(queryset)
+        assert any(
+            'reviews_title_genre_genre_title_idx' in step for step in plan
+        ), f'Фильтр по жанру должен использовать составной индекс: {plan}'
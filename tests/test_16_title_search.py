@@ -0,0 +1,65 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TitleSearch:
+    url = '/api/v1/titles/'
+
+    def search(self, client, text, **params):
+        response = client.get(self.url, {'q': text, **params})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}?q=` возвращает ответ '
+            'со статусом 200.'
+        )
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_is_case_insensitive_prefix(self, client,
+                                                  admin_client):
+        create_titles(admin_client)
+        assert self.search(client, 'терМ') == ['Терминатор'], (
+            'Проверьте, что поиск `?q=` ищет по префиксу слова без учёта '
+            'регистра, в том числе для кириллицы.'
+        )
+        assert self.search(client, 'крепкий ореш') == ['Крепкий орешек']
+        assert self.search(client, 'yippie') == ['Крепкий орешек'], (
+            'Проверьте, что поиск `?q=` ищет и по описанию произведения.'
+        )
+        assert self.search(client, 'терминатор орешек') == []
+        assert self.search(client, '"*:)') == []
+
+    def test_02_search_is_ranked(self, client, admin_client):
+        _, categories, genres = create_titles(admin_client)
+        for name, description in (
+            ('Кот в сапогах', 'Сказка'),
+            ('Кот', 'Кот, кот и ещё раз кот'),
+        ):
+            admin_client.post(self.url, data={
+                'name': name,
+                'year': 1990,
+                'genre': [genres[0]['slug']],
+                'category': categories[0]['slug'],
+                'description': description,
+            })
+        assert self.search(client, 'кот') == ['Кот', 'Кот в сапогах'], (
+            'Проверьте, что результаты поиска `?q=` упорядочены по '
+            'релевантности.'
+        )
+        assert self.search(client, 'кот', ordering='-name') == [
+            'Кот в сапогах', 'Кот'
+        ]
+
+    def test_03_search_index_follows_writes(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_url = f'{self.url}{titles[0]["id"]}/'
+        admin_client.patch(title_url, data={'name': 'Хищник'})
+        assert self.search(client, 'терминатор') == []
+        assert self.search(client, 'хищник') == ['Хищник'], (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'произведения.'
+        )
+        admin_client.delete(title_url)
+        assert self.search(client, 'хищник') == []
@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17TextSearch:
+
+    def test_01_search_reviews_and_comments(self, admin_client, admin,
+                                            user_client, user,
+                                            moderator_client, moderator):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+
+        response = moderator_client.get(
+            '/api/v1/search/reviews/', {'q': 'REVIEW numb 2'}
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что GET-запрос модератора к '
+            '`/api/v1/search/reviews/` возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert [review['id'] for review in data['results']] == [
+            reviews[1]['id']
+        ], (
+            'Проверьте, что `/api/v1/search/reviews/?q=` ищет по тексту '
+            'отзывов.'
+        )
+        assert data['results'][0]['title'] == titles[0]['id']
+
+        response = admin_client.get(
+            '/api/v1/search/comments/', {'q': 'comment'}
+        )
+        results = response.json()['results']
+        assert [comment['id'] for comment in results] == [
+            comment['id'] for comment in reversed(comments)
+        ], (
+            'Проверьте, что `/api/v1/search/comments/?q=` возвращает '
+            'найденные комментарии, начиная с новых.'
+        )
+        assert results[0]['review'] == reviews[0]['id']
+        assert results[0]['title'] == titles[0]['id']
+
+    def test_02_search_index_follows_writes(self, admin_client, admin,
+                                            moderator_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+        admin_client.patch(url, data={'text': 'отредактированный текст'})
+        response = moderator_client.get(
+            '/api/v1/search/reviews/', {'q': 'Отредактированный'}
+        )
+        assert len(response.json()['results']) == 1, (
+            'Проверьте, что поисковый индекс отзывов обновляется при '
+            'изменении отзыва.'
+        )
+        admin_client.delete(url)
+        response = moderator_client.get(
+            '/api/v1/search/comments/', {'q': 'comment'}
+        )
+        assert response.json()['results'] == [], (
+            'Проверьте, что поисковый индекс комментариев обновляется при '
+            'удалении отзыва вместе с комментариями.'
+        )
+
+    def test_03_search_pagination_and_permissions(self, client, user_client,
+                                                  moderator_client,
+                                                  populate_catalog):
+        populate_catalog(12)
+        response = moderator_client.get(
+            '/api/v1/search/comments/', {'q': 'комментарий', 'limit': 5}
+        )
+        data = response.json()
+        assert len(data['results']) == 5 and data['next'], (
+            'Проверьте, что результаты поиска разбиты на страницы '
+            'курсорной пагинацией.'
+        )
+        found = len(data['results'])
+        while data['next']:
+            data = moderator_client.get(data['next']).json()
+            found += len(data['results'])
+        assert found == 12
+
+        response = client.get('/api/v1/search/reviews/', {'q': 'отзыв'})
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        response = user_client.get('/api/v1/search/reviews/', {'q': 'отзыв'})
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что поиск по отзывам доступен только модераторам и '
+            'администраторам.'
+        )
@@ -0,0 +1,143 @@
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Autocomplete:
+    url = '/api/v1/autocomplete/'
+
+    @pytest.fixture(autouse=True)
+    def reset_index(self):
+        # БД очищается между тестами без сигналов, поэтому индекс
+        # в памяти сбрасывается вместе с кэшем.
+        from reviews.autocomplete import autocomplete_index
+
+        cache.clear()
+        autocomplete_index.version = None
+
+    def complete(self, client, text, **params):
+        response = client.get(self.url, {'q': text, **params})
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return response.json()
+
+    def test_01_prefix_matches(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        data = self.complete(client, 'КР')
+        assert data['titles'] == [
+            {'id': titles[1]['id'], 'name': 'Крепкий орешек'}
+        ], (
+            f'Проверьте, что `{self.url}?q=` ищет произведения по префиксу '
+            'без учёта регистра.'
+        )
+        assert self.complete(client, 'ореш')['titles'][0]['name'] == (
+            'Крепкий орешек'
+        ), 'Проверьте, что автодополнение ищет по началу любого слова.'
+        data = self.complete(client, 'ко')
+        assert data['genres'] == [{'name': 'Комедия', 'slug': 'comedy'}]
+        data = self.complete(client, 'книг')
+        assert data['categories'] == [{'name': 'Книги', 'slug': 'books'}]
+        assert self.complete(client, '') == {
+            'titles': [], 'genres': [], 'categories': []
+        }
+
+    def test_02_no_database_queries(self, client, admin_client):
+        create_titles(admin_client)
+        self.complete(client, 'т')
+        with CaptureQueriesContext(connection) as context:
+            self.complete(client, 'тер')
+        assert not context.captured_queries, (
+            f'Проверьте, что `{self.url}` отвечает из индекса в памяти без '
+            'запросов к БД.'
+        )
+
+    def test_03_index_follows_writes(self, client, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        self.complete(client, 'т')
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Ёлки'}
+        )
+        assert self.complete(client, 'терм')['titles'] == []
+        assert self.complete(client, 'ел')['titles'] == [
+            {'id': titles[0]['id'], 'name': 'Ёлки'}
+        ], (
+            'Проверьте, что индекс автодополнения обновляется при изменении '
+            'произведения, а «ё» ищется как «е».'
+        )
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        assert self.complete(client, 'уж')['genres'] == []
+
+    def test_04_limit(self, client, populate_catalog):
+        populate_catalog(20)
+        assert len(self.complete(client, 'жанр')['genres']) == 10
+        assert len(self.complete(client, 'жанр', limit=3)['genres']) == 3
+
+    @pytest.fixture
+    def memory_index(self, monkeypatch):
+        """Отдельный индекс, заполненный без БД."""
+        from reviews.autocomplete import PrefixIndex
+
+        index = PrefixIndex()
+        index.version = 0
+        monkeypatch.setattr(index, 'ensure_fresh', lambda: None)
+        monkeypatch.setattr(index, '_bump_version', lambda: None)
+        return index
+
+    def test_05_many_matches(self, memory_index):
+        from reviews.models import Genre, Title
+
+        for pk in range(50000):
+            memory_index.objects[('titles', pk)] = {'id': pk}
+            memory_index.entries['titles'].append((f'про {pk}', pk))
+        memory_index.entries['titles'].sort()
+        memory_index.update(Genre(id=1, name='Проза', slug='prose'))
+        memory_index.update(Title(id=50000, name='Проверка'))
+        start = time.perf_counter()
+        data = memory_index.search('про', 10)
+        elapsed = time.perf_counter() - start
+        assert (len(data['titles']), data['genres']) == (
+            10, [{'name': 'Проза', 'slug': 'prose'}]
+        ), 'Проверьте, что limit действует для каждого вида отдельно.'
+        assert elapsed < 0.01, (
+            'Проверьте, что поиск просматривает не больше limit совпадений '
+            f'каждого вида: 50 000 совпадений заняли {elapsed:.3f} с.'
+        )
+
+    def test_06_concurrent_writes(self, memory_index):
+        from reviews.models import Title
+
+        errors = []
+        stop = threading.Event()
+
+        def read():
+            while not stop.is_set():
+                try:
+                    memory_index.search('произведение', 5)
+                except Exception as error:
+                    errors.append(error)
+                    return
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for pk in range(3000):
+            memory_index.update(Title(id=pk % 50, name=f'Произведение {pk}'))
+            if pk % 7 == 0:
+                memory_index.remove('titles', pk % 50)
+        stop.set()
+        for reader in readers:
+            reader.join()
+        assert not errors, (
+            'Проверьте, что поиск по индексу не падает при одновременной '
+            f'записи: {errors!r}.'
+        )
@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+def query_plan(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return ' '.join(row[-1] for row in cursor.fetchall())
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19NamePrefix:
+
+    def names(self, client, url, **params):
+        response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return [item['name'] for item in response.json()['results']]
+
+    def test_01_search_name_is_normalized(self, admin_client):
+        from reviews.models import Category, Genre, Title
+
+        create_titles(admin_client)
+        title = Title.objects.get(name='Крепкий орешек')
+        assert title.search_name == 'крепкий орешек', (
+            'Проверьте, что при сохранении произведения search_name '
+            'заполняется названием в нижнем регистре.'
+        )
+        title.name = '  Ёлки   Палки '
+        title.save()
+        title.refresh_from_db()
+        assert title.search_name == 'елки палки', (
+            'Проверьте, что search_name заменяет ё на е и схлопывает '
+            'пробелы.'
+        )
+        assert Genre.objects.get(slug='comedy').search_name == 'комедия'
+        assert Category.objects.get(slug='books').search_name == 'книги'
+
+    def test_02_prefix_search(self, client, admin_client):
+        create_titles(admin_client)
+        genres_url = '/api/v1/genres/'
+        assert self.names(client, genres_url, name_prefix='ДР') == [
+            'Драма'
+        ], (
+            f'Проверьте, что `{genres_url}?name_prefix=` ищет жанры по '
+            'началу названия без учёта регистра.'
+        )
+        assert self.names(client, genres_url, name_prefix='рама') == [], (
+            f'Проверьте, что `{genres_url}?name_prefix=` ищет только по '
+            'началу названия.'
+        )
+        assert self.names(
+            client, '/api/v1/categories/', name_prefix='фил'
+        ) == ['Фильм']
+        assert self.names(
+            client, '/api/v1/titles/', name_prefix='крепкий ОР'
+        ) == ['Крепкий орешек'], (
+            'Проверьте, что `/api/v1/titles/?name_prefix=` ищет '
+            'произведения по началу названия без учёта регистра.'
+        )
+        assert len(self.names(client, genres_url)) == 3
+
+    def test_03_substring_search_kept(self, client, admin_client):
+        create_titles(admin_client)
+        assert self.names(client, '/api/v1/genres/', search='едия') == [
+            'Комедия'
+        ], (
+            'Проверьте, что `/api/v1/genres/?search=` по-прежнему ищет '
+            'по любой части названия.'
+        )
+        assert self.names(client, '/api/v1/categories/', search='ильм') == [
+            'Фильм'
+        ]
+        assert self.names(client, '/api/v1/titles/', name='орешек') == [
+            'Крепкий орешек'
+        ], (
+            'Проверьте, что `/api/v1/titles/?name=` по-прежнему ищет по '
+            'любой части названия.'
+        )
+
+    def test_04_prefix_search_uses_index(self, client, admin_client):
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            self.names(client, '/api/v1/genres/', name_prefix='ко')
+            self.names(client, '/api/v1/categories/', name_prefix='ко')
+            self.names(client, '/api/v1/titles/', name_prefix='тер')
+        statements = [
+            query['sql'] for query in context.captured_queries
+            if '"search_name" >=' in query['sql']
+        ]
+        assert len(statements) >= 3, (
+            'Проверьте, что поиск по началу названия выполняется как '
+            'диапазон по search_name.'
+        )
+        for sql in statements:
+            plan = query_plan(sql)
+            assert 'search_name' in plan and 'TEMP B-TREE' not in plan, (
+                'Проверьте, что поиск по началу названия использует индекс '
+                f'search_name: {plan}'
+            )
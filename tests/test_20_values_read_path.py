@@ -0,0 +1,104 @@
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20ValuesReadPath:
+    """Списки собираются через values() (api.readers) и должны давать
+    тот же JSON, что и сериализаторы моделей."""
+
+    @pytest.fixture
+    def catalog(self, admin_client, admin, user_client, user,
+                moderator_client, moderator):
+        from reviews.models import Category, Title
+
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client,
+        }
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        # Произведение без категории и без оценок, с ё в названии.
+        admin_client.post('/api/v1/titles/', data={
+            'name': 'Ёжик в тумане',
+            'year': 1975,
+            'genre': ['drama', 'horror'],
+            'category': 'films',
+        })
+        Category.objects.filter(slug='films').delete()
+        Title.objects.create(name='Без жанров', year=2000)
+        return titles[0]['id'], reviews[0]['id']
+
+    def assert_same_json(self, client, url, serializer_class, queryset):
+        response = client.get(url)
+        expected = serializer_class(queryset, many=True).data
+        renderer = JSONRenderer()
+        assert renderer.render(response.data['results']) == (
+            renderer.render(expected)
+        ), (
+            f'Проверьте, что список `{url}` через values() отдаёт тот же '
+            'JSON, что и сериализатор модели.'
+        )
+
+    def test_01_lists_match_serializers(self, client, catalog):
+        from api.serializers import (CategorySerializer, CommentSerializer,
+                                     GenreSerializer, ReviewSerializer,
+                                     TitleReadSerializer)
+        from reviews.models import Category, Comment, Genre, Review, Title
+
+        title_id, review_id = catalog
+        titles = Title.objects.select_related('category').prefetch_related(
+            'genre'
+        )
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        for url, serializer_class, queryset in (
+            ('/api/v1/titles/', TitleReadSerializer, titles.order_by('name')),
+            (
+                '/api/v1/titles/top/',
+                TitleReadSerializer,
+                titles.filter(weighted_rating__isnull=False).order_by(
+                    '-weighted_rating', 'name'
+                ),
+            ),
+            ('/api/v1/genres/', GenreSerializer, Genre.objects.all()),
+            ('/api/v1/categories/', CategorySerializer,
+             Category.objects.all()),
+            (
+                reviews_url,
+                ReviewSerializer,
+                Review.objects.filter(title_id=title_id).order_by(
+                    'pub_date', 'id'
+                ),
+            ),
+            (
+                f'{reviews_url}{review_id}/comments/',
+                CommentSerializer,
+                Comment.objects.filter(review_id=review_id).order_by(
+                    'pub_date', 'id'
+                ),
+            ),
+        ):
+            self.assert_same_json(client, url, serializer_class, queryset)
+
+    def test_02_cursor_pages_match(self, client, catalog):
+        from api.serializers import TitleReadSerializer
+        from reviews.models import Title
+
+        url = '/api/v1/titles/?pagination=cursor&limit=2'
+        names = []
+        while url:
+            data = client.get(url).json()
+            names += [item['name'] for item in data['results']]
+            url = data['next']
+        expected = Title.objects.order_by('name', 'id').prefetch_related(
+            'genre'
+        )
+        assert names == [
+            item['name']
+            for item in TitleReadSerializer(expected, many=True).data
+        ], (
+            'Проверьте, что курсорная пагинация работает со строками '
+            'из values().'
+        )
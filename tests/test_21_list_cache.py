@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21ListCache:
+
+    def get_names(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return [item['name'] for item in response.json()['results']]
+
+    def test_01_cached_list_skips_database(self, client, admin_client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        for url in (
+            '/api/v1/genres/',
+            '/api/v1/genres/?search=едия',
+            '/api/v1/categories/',
+        ):
+            expected = self.get_names(client, url)
+            with CaptureQueriesContext(connection) as context:
+                assert self.get_names(client, url) == expected
+            assert not context.captured_queries, (
+                f'Проверьте, что повторный GET-запрос к `{url}` отдаётся из '
+                'кэша без запросов к БД.'
+            )
+        assert self.get_names(client, '/api/v1/genres/?search=едия') == [
+            'Комедия'
+        ], 'Проверьте, что ответы с разным ?search= кэшируются отдельно.'
+
+    def test_02_writes_invalidate_cache(self, client, admin_client):
+        create_genre(admin_client)
+        url = '/api/v1/genres/'
+        self.get_names(client, url)
+        admin_client.post(url, data={'name': 'Мюзикл', 'slug': 'musical'})
+        assert 'Мюзикл' in self.get_names(client, url), (
+            f'Проверьте, что создание жанра сбрасывает кэш `{url}`.'
+        )
+        admin_client.delete(f'{url}musical/')
+        assert 'Мюзикл' not in self.get_names(client, url), (
+            f'Проверьте, что удаление жанра сбрасывает кэш `{url}`.'
+        )
+        create_categories(admin_client)
+        self.get_names(client, '/api/v1/categories/')
+        admin_client.delete('/api/v1/categories/books/')
+        assert self.get_names(client, '/api/v1/categories/') == ['Фильм']
+
+    def test_03_admin_edit_invalidates_cache(self, client, admin_client,
+                                             user_superuser):
+        from reviews.models import Genre
+
+        create_genre(admin_client)
+        url = '/api/v1/genres/'
+        self.get_names(client, url)
+        genre = Genre.objects.get(slug='drama')
+        site = Client()
+        site.force_login(user_superuser)
+        response = site.post(
+            f'/admin/reviews/genre/{genre.id}/change/',
+            {'name': 'Мелодрама', 'slug': 'drama'},
+        )
+        assert response.status_code == HTTPStatus.FOUND
+        assert 'Мелодрама' in self.get_names(client, url), (
+            'Проверьте, что изменение жанра в админке сбрасывает кэш '
+            f'`{url}`.'
+        )
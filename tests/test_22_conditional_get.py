@@ -0,0 +1,165 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+
+from tests.utils import create_single_comment, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22ConditionalGet:
+
+    def get_etag(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header('ETag'), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит ETag.'
+        )
+        return response
+
+    def assert_not_modified(self, client, url, etag):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с совпадающим '
+            'If-None-Match возвращает ответ со статусом 304.'
+        )
+        assert not context.captured_queries, (
+            f'Проверьте, что 304 для `{url}` отдаётся без запросов к БД.'
+        )
+        assert response['ETag'] == etag
+
+    def assert_modified(self, client, url, etag, message):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, message
+        assert response['ETag'] != etag, message
+        return response
+
+    def test_01_title_detail(self, client, user_client, admin_client,
+                             populate_catalog):
+        from reviews.models import Genre
+
+        title_id = populate_catalog(3)['title_id']
+        url = f'/api/v1/titles/{title_id}/'
+        etag = self.get_etag(client, url)['ETag']
+        self.assert_not_modified(client, url, etag)
+        create_single_review(user_client, title_id, 'Отзыв', 3)
+        etag = self.assert_modified(
+            client, url, etag,
+            'Проверьте, что новый отзыв меняет ETag произведения.'
+        )['ETag']
+        admin_client.patch(url, {'description': 'Новое описание'})
+        etag = self.assert_modified(
+            client, url, etag,
+            'Проверьте, что изменение произведения меняет его ETag.'
+        )['ETag']
+        genre = Genre.objects.get(slug='genre-0')
+        genre.name = 'Переименованный жанр'
+        genre.save()
+        self.assert_modified(
+            client, url, etag,
+            'Проверьте, что изменение вложенного жанра меняет ETag.'
+        )
+        assert not client.get('/api/v1/titles/').has_header('ETag')
+
+    def test_02_reviews_and_comments(self, client, user_client,
+                                     populate_catalog):
+        from reviews.models import Comment, Review
+
+        ids = populate_catalog(3)
+        reviews_url = f'/api/v1/titles/{ids["title_id"]}/reviews/'
+        comments_url = f'{reviews_url}{ids["review_id"]}/comments/'
+        review = Review.objects.get(pk=ids['review_id'])
+        for url, last_modified in (
+            (reviews_url, Review.objects.latest('pub_date').pub_date),
+            (f'{reviews_url}{review.id}/', review.pub_date),
+            (comments_url, Comment.objects.latest('pub_date').pub_date),
+        ):
+            response = self.get_etag(client, url)
+            self.assert_not_modified(client, url, response['ETag'])
+            assert response['Last-Modified'] == http_date(
+                last_modified.timestamp()
+            ), (
+                f'Проверьте, что Last-Modified для `{url}` — дата самой '
+                'новой записи.'
+            )
+        etag = self.get_etag(client, reviews_url)['ETag']
+        review = create_single_review(
+            user_client, ids['title_id'], 'Отзыв', 5
+        ).json()
+        self.assert_modified(
+            client, reviews_url, etag,
+            'Проверьте, что новый отзыв меняет ETag списка отзывов.'
+        )
+        etag = self.get_etag(client, comments_url)['ETag']
+        create_single_comment(
+            user_client, ids['title_id'], ids['review_id'], 'Комментарий'
+        )
+        self.assert_modified(
+            client, comments_url, etag,
+            'Проверьте, что новый комментарий меняет ETag списка '
+            'комментариев.'
+        )
+        detail_url = f'{reviews_url}{review["id"]}/'
+        etag = self.get_etag(client, detail_url)['ETag']
+        user_client.patch(detail_url, {'text': 'Исправленный отзыв'})
+        self.assert_modified(
+            client, detail_url, etag,
+            'Проверьте, что правка отзыва меняет его ETag.'
+        )
+
+    def test_03_deleted_parent(self, client, user_client, admin_client,
+                               populate_catalog):
+        from reviews.models import Title
+
+        populate_catalog(3)
+        title_id = Title.objects.filter(
+            reviews__isnull=True
+        ).order_by('id').values_list('id', flat=True)[0]
+        review = create_single_review(
+            user_client, title_id, 'Отзыв', 5
+        ).json()
+        reviews_url = f'/api/v1/titles/{title_id}/reviews/'
+        comments_url = f'{reviews_url}{review["id"]}/comments/'
+        comments_etag = self.get_etag(client, comments_url)['ETag']
+        user_client.delete(f'{reviews_url}{review["id"]}/')
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=comments_etag)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что после удаления отзыва без комментариев '
+            f'`{comments_url}` с прежним ETag возвращает 404, а не 304.'
+        )
+        reviews_etag = self.get_etag(client, reviews_url)['ETag']
+        admin_client.delete(f'/api/v1/titles/{title_id}/')
+        response = client.get(reviews_url, HTTP_IF_NONE_MATCH=reviews_etag)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            f'Проверьте, что после удаления произведения без отзывов '
+            f'`{reviews_url}` с прежним ETag возвращает 404, а не 304.'
+        )
+
+    def test_04_author_renamed(self, client, user_client, populate_catalog):
+        ids = populate_catalog(3)
+        review = create_single_review(
+            user_client, ids['title_id'], 'Отзыв', 5
+        ).json()
+        create_single_comment(
+            user_client, ids['title_id'], ids['review_id'], 'Комментарий'
+        )
+        reviews_url = f'/api/v1/titles/{ids["title_id"]}/reviews/'
+        urls = (
+            reviews_url,
+            f'{reviews_url}{review["id"]}/',
+            f'{reviews_url}{ids["review_id"]}/comments/',
+        )
+        etags = {url: self.get_etag(client, url)['ETag'] for url in urls}
+        response = user_client.patch(
+            '/api/v1/users/me/', data={'username': 'Renamed'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        for url, etag in etags.items():
+            response = self.assert_modified(
+                client, url, etag,
+                f'Проверьте, что смена имени автора меняет ETag `{url}`.'
+            )
+            assert 'Renamed' in response.content.decode()
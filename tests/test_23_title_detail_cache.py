@@ -0,0 +1,110 @@
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23TitleDetailCache:
+
+    def get_title(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return response.json()
+
+    def test_01_detail_is_cached(self, client, populate_catalog):
+        url = f'/api/v1/titles/{populate_catalog(3)["title_id"]}/'
+        expected = self.get_title(client, url)
+        with CaptureQueriesContext(connection) as context:
+            assert self.get_title(client, url) == expected
+        assert not context.captured_queries, (
+            f'Проверьте, что повторный GET-запрос к `{url}` отдаётся из '
+            'кэша без запросов к БД.'
+        )
+
+    def test_02_writes_invalidate_detail(self, client, user_client,
+                                         user_superuser, populate_catalog,
+                                         monkeypatch):
+        from reviews.management.commands import import_csv
+        from reviews.models import Category, Genre, Title
+
+        title_id = populate_catalog(3)['title_id']
+        url = f'/api/v1/titles/{title_id}/'
+        self.get_title(client, url)
+        create_single_review(user_client, title_id, 'Отзыв', 10)
+        assert self.get_title(client, url)['rating'] is not None, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведения.'
+        )
+        category = Category.objects.get(slug='category-0')
+        category.name = 'Новая категория'
+        category.save()
+        assert self.get_title(client, url)['category']['name'] == (
+            'Новая категория'
+        ), 'Проверьте, что изменение категории сбрасывает кэш произведения.'
+
+        site = Client()
+        site.force_login(user_superuser)
+        title = Title.objects.get(pk=title_id)
+        genre = Genre.objects.get(slug='genre-2')
+        response = site.post(f'/admin/reviews/title/{title_id}/change/', {
+            'name': title.name,
+            'year': title.year,
+            'category': title.category_id,
+            'genre': [genre.id],
+            'description': 'Из админки',
+        })
+        assert response.status_code == HTTPStatus.FOUND
+        data = self.get_title(client, url)
+        assert data['description'] == 'Из админки' and data['genre'] == [
+            {'name': genre.name, 'slug': genre.slug}
+        ], (
+            'Проверьте, что правка произведения и его жанров в админке '
+            'сбрасывает кэш.'
+        )
+        genre = Genre.objects.get(slug='genre-0')
+        monkeypatch.setattr(import_csv, 'open_csv', lambda name: [
+            ['id', 'title_id', 'genre_id'], ['1', title_id, genre.id]
+        ])
+        import_csv.import_csv('genre_title', Title.genre.through)
+        assert len(self.get_title(client, url)['genre']) == 2, (
+            'Проверьте, что импорт жанров произведения через import_csv '
+            'сбрасывает кэш.'
+        )
+
+    def test_03_concurrent_misses_are_coalesced(self, settings):
+        from api.caching import get_or_render
+
+        settings.RESPONSE_CACHE_LOCK_POLL = 0.01
+        builds = []
+
+        def build():
+            builds.append(1)
+            time.sleep(0.2)
+            return HttpResponse(b'{}', content_type='application/json')
+
+        responses = []
+        threads = [
+            threading.Thread(target=lambda: responses.append(
+                get_or_render('test:coalesced', build, 60)
+            ))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(builds) == 1, (
+            'Проверьте, что одновременные промахи кэша по одному ключу '
+            'строят ответ один раз.'
+        )
+        assert [response.content for response in responses] == [b'{}'] * 5
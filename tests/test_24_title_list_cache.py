@@ -0,0 +1,115 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24TitleListCache:
+    url = '/api/v1/titles/'
+
+    @pytest.fixture
+    def refreshes(self, monkeypatch):
+        """Фоновые обновления не запускаются, а копятся в списке."""
+        scheduled = []
+        monkeypatch.setattr(
+            'api.caching.run_in_background', scheduled.append
+        )
+        return scheduled
+
+    def get_names(self, client, query=''):
+        response = client.get(f'{self.url}{query}')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return [item['name'] for item in response.json()['results']]
+
+    def add_title(self, admin_client, name):
+        admin_client.post(self.url, data={
+            'name': name, 'year': 2000, 'genre': ['drama'],
+            'category': 'films',
+        })
+
+    def test_01_normalized_key(self, client, admin_client):
+        create_titles(admin_client)
+        expected = self.get_names(client, '?genre=comedy&limit=5')
+        with CaptureQueriesContext(connection) as context:
+            names = self.get_names(
+                client, '?limit=5&year_min=&genre=comedy&utm=1'
+            )
+        assert names == expected and not context.captured_queries, (
+            'Проверьте, что кэш списка произведений не зависит от порядка '
+            'параметров, пустых и посторонних параметров.'
+        )
+        assert self.get_names(client, '?genre=drama') == ['Крепкий орешек']
+
+    def test_02_stale_while_revalidate(self, client, admin_client, settings,
+                                       refreshes):
+        settings.LIST_MAX_STALE = 60
+        create_titles(admin_client)
+        before = self.get_names(client)
+        self.add_title(admin_client, 'Афоня')
+        assert self.get_names(client) == before, (
+            'Проверьте, что в пределах LIST_MAX_STALE отдаётся '
+            'устаревшая страница списка.'
+        )
+        self.get_names(client)
+        assert len(refreshes) == 1, (
+            'Проверьте, что устаревшую страницу обновляет один фоновый '
+            'поток.'
+        )
+        refreshes.pop()()
+        with CaptureQueriesContext(connection) as context:
+            assert self.get_names(client) == ['Афоня'] + before
+        assert not context.captured_queries, (
+            'Проверьте, что фоновое обновление сохраняет свежую страницу '
+            'в кэш.'
+        )
+
+    def test_03_staleness_is_bounded(self, client, admin_client, settings,
+                                     refreshes):
+        settings.LIST_MAX_STALE = 0
+        create_titles(admin_client)
+        self.get_names(client)
+        self.add_title(admin_client, 'Афоня')
+        assert 'Афоня' in self.get_names(client), (
+            'Проверьте, что страница старше LIST_MAX_STALE строится '
+            'заново в запросе.'
+        )
+        assert not refreshes
+
+    def test_04_refresh_gets_own_request(self, client, admin_client,
+                                         settings, refreshes, monkeypatch):
+        from api import caching
+
+        settings.LIST_MAX_STALE = 60
+        create_titles(admin_client)
+        self.get_names(client, '?genre=comedy')
+        self.add_title(admin_client, 'Афоня')
+        originals, copies = [], []
+        detached_request = caching.DetachedRequest
+
+        def track(request):
+            originals.append(request)
+            copies.append(detached_request(request))
+            return copies[-1]
+
+        monkeypatch.setattr('api.caching.DetachedRequest', track)
+        client.get(self.url, {'genre': 'comedy'}, HTTP_AUTHORIZATION='X y')
+        refreshes.pop()()
+        original, copy = originals[0], copies[0]
+        assert copy is not original and copy.META is not original.META, (
+            'Проверьте, что фоновое обновление получает свою копию '
+            'запроса, а не запрос основного потока.'
+        )
+        assert (copy.path, copy.GET.dict(), copy.scheme) == (
+            original.path, {'genre': 'comedy'}, original.scheme
+        )
+        assert copy.META['HTTP_AUTHORIZATION'] == 'X y'
+        assert caching.refresh_executor._max_workers == (
+            settings.RESPONSE_REFRESH_WORKERS
+        ), 'Проверьте, что фоновые обновления идут в пуле потоков.'
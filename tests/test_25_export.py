@@ -0,0 +1,79 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Export:
+    titles_url = '/api/v1/export/titles.ndjson'
+    reviews_url = '/api/v1/export/reviews.csv'
+
+    def download(self, client, url):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос администратора к `{url}` возвращает '
+            'ответ со статусом 200.'
+        )
+        assert response.streaming, (
+            f'Проверьте, что `{url}` отдаёт ответ потоком.'
+        )
+        return b''.join(response.streaming_content).decode()
+
+    def test_01_admin_only(self, client, user_client, moderator_client):
+        for url in (self.titles_url, self.reviews_url):
+            assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+            for role_client in (user_client, moderator_client):
+                assert role_client.get(url).status_code == (
+                    HTTPStatus.FORBIDDEN
+                ), f'Проверьте, что `{url}` доступен только администратору.'
+
+    def test_02_titles_ndjson(self, admin_client, populate_catalog,
+                              settings):
+        from api.serializers import TitleReadSerializer
+        from reviews.models import Title
+
+        settings.EXPORT_CHUNK_SIZE = 4
+        populate_catalog(10)
+        with CaptureQueriesContext(connection) as context:
+            content = self.download(admin_client, self.titles_url)
+        titles = [json.loads(line) for line in content.splitlines()]
+        expected = TitleReadSerializer(
+            Title.objects.order_by('id').prefetch_related('genre'), many=True
+        ).data
+        assert titles == json.loads(json.dumps(expected)), (
+            f'Проверьте, что `{self.titles_url}` отдаёт по произведению '
+            'на строку в том же виде, что и `/api/v1/titles/`.'
+        )
+        catalog_queries = [
+            query for query in context.captured_queries
+            if '"reviews_' in query['sql']
+        ]
+        assert len(catalog_queries) <= 1 + 2 * 3, (
+            f'Проверьте, что `{self.titles_url}` выбирает жанры и '
+            'категории одним запросом на пачку строк, а не на каждое '
+            'произведение.'
+        )
+
+    def test_03_reviews_csv(self, admin_client, populate_catalog):
+        from reviews.models import Review
+
+        populate_catalog(5)
+        rows = list(csv.reader(io.StringIO(
+            self.download(admin_client, self.reviews_url)
+        )))
+        assert rows[0] == [
+            'id', 'title_id', 'author', 'score', 'text', 'pub_date'
+        ]
+        assert len(rows) - 1 == Review.objects.count(), (
+            f'Проверьте, что `{self.reviews_url}` содержит все отзывы.'
+        )
+        review = Review.objects.select_related('author').order_by('id')[0]
+        assert rows[1][:5] == [
+            str(review.id), str(review.title_id), review.author.username,
+            str(review.score), review.text,
+        ]
@@ -0,0 +1,124 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26TitleBulk:
+    url = '/api/v1/titles/bulk/'
+
+    def post(self, client, data):
+        return client.post(
+            self.url, data=json.dumps(data), content_type='application/json'
+        )
+
+    def test_01_permissions_and_format(self, client, user_client,
+                                       admin_client):
+        assert self.post(client, []).status_code == HTTPStatus.UNAUTHORIZED
+        assert self.post(user_client, []).status_code == HTTPStatus.FORBIDDEN
+        response = self.post(admin_client, {'name': 'Не список'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что POST-запрос к `{self.url}` без массива '
+            'возвращает ответ со статусом 400.'
+        )
+
+    def test_02_per_item_results(self, client, admin_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        response = self.post(admin_client, [
+            {'name': 'Ёлки', 'year': 2010, 'genre': ['comedy', 'comedy'],
+             'category': 'films', 'description': 'Новогодняя'},
+            {'name': 'Без категории', 'year': 2000, 'genre': ['x', 'y'],
+             'category': 'nope'},
+            {'name': 'Из будущего', 'year': 3000, 'genre': ['drama'],
+             'category': 'films'},
+            {'id': titles[0]['id'], 'name': 'Терминатор 2', 'year': 1991,
+             'genre': ['drama'], 'category': 'books'},
+            {'id': 100500, 'name': 'Нет такого', 'year': 2000,
+             'genre': ['drama'], 'category': 'films'},
+        ])
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [result.get('status') for result in results] == [
+            'created', None, None, 'updated', None
+        ], (
+            f'Проверьте, что `{self.url}` сохраняет корректные элементы и '
+            'возвращает результат для каждого элемента по порядку.'
+        )
+        errors = results[1]['errors']
+        assert errors['genre'] == ['Не найдены объекты с slug: x, y.'] and (
+            'nope' in errors['category'][0]
+        ), 'Проверьте, что в ошибке перечислены все неизвестные слаги.'
+        assert 'year' in results[2]['errors']
+        assert 'id' in results[4]['errors']
+
+        created = Title.objects.get(pk=results[0]['id'])
+        assert created.search_name == 'елки'
+        assert list(created.genre.values_list('slug', flat=True)) == [
+            'comedy'
+        ]
+        updated = Title.objects.get(pk=titles[0]['id'])
+        assert (updated.name, updated.category.slug) == (
+            'Терминатор 2', 'books'
+        )
+        assert list(updated.genre.values_list('slug', flat=True)) == [
+            'drama'
+        ]
+        names = [item['name'] for item in client.get(
+            '/api/v1/titles/'
+        ).json()['results']]
+        assert 'Ёлки' in names and 'Терминатор 2' in names, (
+            'Проверьте, что массовая запись сбрасывает кэш списка '
+            'произведений.'
+        )
+
+    def test_03_queries_do_not_grow(self, admin_client):
+        create_titles(admin_client)
+
+        def count_queries(size, offset):
+            items = [
+                {'name': f'Произведение {offset + idx}', 'year': 2000,
+                 'genre': ['drama', 'comedy'], 'category': 'films'}
+                for idx in range(size)
+            ]
+            with CaptureQueriesContext(connection) as context:
+                response = self.post(admin_client, items)
+            assert all(
+                result['status'] == 'created'
+                for result in response.json()['results']
+            )
+            return len(context.captured_queries)
+
+        assert count_queries(3, 0) == count_queries(30, 100), (
+            f'Проверьте, что число SQL-запросов `{self.url}` не зависит '
+            'от количества элементов.'
+        )
+
+    def test_04_duplicate_ids(self, admin_client):
+        from reviews.models import Title
+
+        titles, _, _ = create_titles(admin_client)
+        item = {'id': titles[0]['id'], 'name': 'Дубль', 'year': 2000,
+                'genre': ['drama'], 'category': 'films'}
+        response = self.post(admin_client, [
+            item, item, {**item, 'name': 'Другой', 'genre': ['comedy']},
+        ])
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что повтор id в запросе к `{self.url}` не '
+            'прерывает пачку.'
+        )
+        results = response.json()['results']
+        assert results[0] == {'id': titles[0]['id'], 'status': 'updated'}
+        assert all('id' in result['errors'] for result in results[1:]), (
+            'Проверьте, что повторы id получают ошибку по элементу.'
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert title.name == 'Дубль'
+        assert list(title.genre.values_list('slug', flat=True)) == ['drama']
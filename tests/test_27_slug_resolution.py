@@ -0,0 +1,61 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27SlugResolution:
+    url = '/api/v1/titles/'
+
+    @pytest.fixture
+    def genres(self):
+        from reviews.models import Genre
+
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {idx}', slug=f'genre-{idx}')
+            for idx in range(10)
+        )
+        return [f'genre-{idx}' for idx in range(10)]
+
+    def test_01_one_query_for_all_genres(self, admin_client, genres):
+        create_categories(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(self.url, data={
+                'name': 'Много жанров',
+                'year': 2000,
+                'genre': genres,
+                'category': 'films',
+            })
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(response.json()['genre']) == len(genres)
+        genre_lookups = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_genre" WHERE' in query['sql']
+        ]
+        assert len(genre_lookups) == 1, (
+            f'Проверьте, что POST-запрос к `{self.url}` находит все жанры '
+            'одним запросом.'
+        )
+
+    def test_02_all_unknown_slugs_reported(self, admin_client, genres):
+        create_categories(admin_client)
+        response = admin_client.post(self.url, data={
+            'name': 'Неизвестные жанры',
+            'year': 2000,
+            'genre': [genres[0], 'missing-1', 'missing-2'],
+            'category': 'missing-category',
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert errors['genre'] == [
+            'Не найдены объекты с slug: missing-1, missing-2.'
+        ], (
+            f'Проверьте, что ответ POST-запроса к `{self.url}` перечисляет '
+            'все неизвестные слаги жанров.'
+        )
+        assert 'missing-category' in errors['category'][0]
@@ -0,0 +1,80 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28TitleBatchGet:
+    url = '/api/v1/titles/'
+    batch_url = '/api/v1/titles/batch-get/'
+
+    def expected(self, ids):
+        from api.serializers import TitleReadSerializer
+        from reviews.models import Title
+
+        titles = Title.objects.prefetch_related('genre').in_bulk(ids)
+        return json.loads(json.dumps(TitleReadSerializer(
+            [titles[pk] for pk in ids], many=True
+        ).data))
+
+    def title_ids(self):
+        from reviews.models import Title
+
+        return list(
+            Title.objects.order_by('id').values_list('id', flat=True)
+        )
+
+    def test_01_ids_in_requested_order(self, client, populate_catalog):
+        populate_catalog(6)
+        ids = self.title_ids()
+        response = client.get(self.url, {
+            'ids': f'{ids[4]},{ids[1]},100500,{ids[2]},{ids[1]}'
+        })
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['results'] == self.expected([ids[4], ids[1], ids[2]]), (
+            f'Проверьте, что `{self.url}?ids=` возвращает произведения в '
+            'запрошенном порядке в формате `/api/v1/titles/{id}/`.'
+        )
+        assert data['missing'] == [100500], (
+            f'Проверьте, что `{self.url}?ids=` перечисляет ненайденные id.'
+        )
+        response = client.post(
+            self.batch_url, data=json.dumps({'ids': [ids[3], ids[0]]}),
+            content_type='application/json',
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос к `{self.batch_url}` доступен '
+            'без авторизации.'
+        )
+        assert response.json() == {
+            'results': self.expected([ids[3], ids[0]]), 'missing': []
+        }
+
+    def test_02_fixed_query_count(self, client, populate_catalog):
+        populate_catalog(30)
+
+        def count_queries(ids):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(
+                    self.url, {'ids': ','.join(map(str, ids))}
+                )
+            assert response.status_code == HTTPStatus.OK
+            return len(context.captured_queries)
+
+        ids = self.title_ids()
+        assert count_queries(ids[:2]) == count_queries(ids) == 3, (
+            f'Проверьте, что `{self.url}?ids=` выполняет одинаковое число '
+            'запросов при любом количестве id.'
+        )
+
+    def test_03_invalid_ids(self, client):
+        for ids in ('1,abc', '', '0'):
+            response = client.get(self.url, {'ids': ids})
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{self.url}?ids={ids}` возвращает ответ со '
+                'статусом 400.'
+            )
@@ -0,0 +1,145 @@
+"""Сокращённые ответы: ?fields= и ?omit=.
+
+Для каждого эндпоинта чтения сравниваются полный ответ и ответ с
+частью полей: количество SQL-запросов, JOIN в них, размер ответа и
+время. Если задана переменная окружения SPARSE_FIELDS_REPORT, отчёт
+в формате JSON записывается в этот файл.
+"""
+from http import HTTPStatus
+from urllib.parse import parse_qs
+
+import pytest
+from django.core.cache import cache
+
+from tests.utils import measure_get
+
+REPORT_ENV = 'SPARSE_FIELDS_REPORT'
+ENDPOINTS = (
+    ('/api/v1/users/', 'fields=username'),
+    ('/api/v1/genres/', 'fields=slug'),
+    ('/api/v1/categories/', 'fields=slug'),
+    ('/api/v1/titles/', 'fields=id,name'),
+    ('/api/v1/titles/top/', 'fields=id,name'),
+    ('/api/v1/titles/{title_id}/', 'fields=id,name'),
+    ('/api/v1/titles/{title_id}/rating-distribution/', 'fields=id,mean'),
+    ('/api/v1/titles/{title_id}/reviews/', 'omit=author'),
+    ('/api/v1/titles/{title_id}/reviews/{review_id}/', 'omit=author'),
+    ('/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+     'omit=author'),
+    ('/api/v1/titles/{title_id}/reviews/{review_id}/comments/{comment_id}/',
+     'omit=author'),
+    ('/api/v1/search/reviews/?q=отзыв', 'omit=author'),
+    ('/api/v1/search/comments/?q=комментарий', 'omit=author,title'),
+)
+
+
+def measure(client, url, sparse=''):
+    cache.clear()
+    response, cost = measure_get(client, url, limit=100, **parse_qs(sparse))
+    return response.json(), cost
+
+
+def first_item(data):
+    if isinstance(data, dict) and 'results' in data:
+        return data['results'][0]
+    if isinstance(data, list):
+        return data[0]
+    return data
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29SparseFields:
+
+    @pytest.fixture
+    def urls(self, populate_catalog):
+        from reviews.models import Comment
+        from reviews.ranking import refresh_weighted_ratings
+
+        ids = populate_catalog(50)
+        refresh_weighted_ratings()
+        ids['comment_id'] = Comment.objects.order_by('id').first().id
+        return ids
+
+    @pytest.mark.parametrize('endpoint,sparse', ENDPOINTS)
+    def test_01_sparse_response_is_cheaper(self, endpoint, sparse,
+                                           admin_client, urls,
+                                           benchmark_report):
+        url = endpoint.format(**urls)
+        full, full_cost = measure(admin_client, url)
+        data, sparse_cost = measure(admin_client, url, sparse)
+        benchmark_report[f'{endpoint}?{sparse}'] = {
+            'full': full_cost, 'sparse': sparse_cost,
+        }
+        params = {
+            name: values[0].split(',')
+            for name, values in parse_qs(sparse).items()
+        }
+        expected = [
+            name for name in first_item(full)
+            if name in params.get('fields', first_item(full))
+            and name not in params.get('omit', ())
+        ]
+        assert list(first_item(data)) == expected, (
+            f'Проверьте, что `{url}?{sparse}` отдаёт только запрошенные '
+            'поля в прежнем порядке.'
+        )
+        assert sparse_cost['queries'] <= full_cost['queries'], (
+            f'Проверьте, что `{url}?{sparse}` не выполняет лишних запросов.'
+        )
+        assert sparse_cost['joins'] <= full_cost['joins']
+        assert sparse_cost['bytes'] < full_cost['bytes']
+
+    def test_02_skipped_relations_are_not_loaded(self, admin_client, urls):
+        _, full = measure(admin_client, '/api/v1/titles/')
+        _, sparse = measure(admin_client, '/api/v1/titles/', 'fields=id,name')
+        assert sparse['queries'] == full['queries'] - 2, (
+            'Проверьте, что без полей genre и category список произведений '
+            'не запрашивает жанры и категории.'
+        )
+        url = '/api/v1/titles/{title_id}/'.format(**urls)
+        _, full = measure(admin_client, url)
+        _, sparse = measure(admin_client, url, 'omit=genre,category')
+        assert (sparse['queries'], sparse['joins']) == (
+            full['queries'] - 1, 0
+        ), (
+            f'Проверьте, что `{url}?omit=genre,category` не загружает жанры '
+            'и не присоединяет категорию.'
+        )
+        url = '/api/v1/titles/{title_id}/reviews/{review_id}/'.format(**urls)
+        _, sparse = measure(admin_client, url, 'omit=author')
+        assert sparse['joins'] == 0, (
+            f'Проверьте, что `{url}?omit=author` не присоединяет автора.'
+        )
+
+    def test_03_cache_and_writes(self, client, admin_client, urls):
+        url = '/api/v1/titles/'
+        full = client.get(url).json()['results'][0]
+        sparse = client.get(url, {'fields': 'name'}).json()['results'][0]
+        assert (list(full)[-1], list(sparse)) == ('category', ['name']), (
+            f'Проверьте, что кэш `{url}` учитывает ?fields=.'
+        )
+        response = admin_client.patch(
+            f'{url}{urls["title_id"]}/?fields=name',
+            data={'name': 'Новое название'}, format='json',
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert 'genre' in response.json(), (
+            'Проверьте, что ?fields= не сокращает ответ на изменяющий '
+            'запрос.'
+        )
+
+    def test_04_unknown_fields(self, client, urls):
+        url = '/api/v1/titles/'
+        full = client.get(url).json()['results']
+        data = client.get(url, {'fields': 'bogus'}).json()['results']
+        assert data == full, (
+            f'Проверьте, что `{url}?fields=` только с неизвестными именами '
+            'отдаёт полные объекты, а не пустые.'
+        )
+        detail = client.get(
+            f'{url}{urls["title_id"]}/', {'fields': 'bogus,name'}
+        ).json()
+        assert list(detail) == ['name']
+        data = client.get(url, {'fields': 'bogus', 'omit': 'genre'}).json()
+        assert 'genre' not in data['results'][0]
+        assert 'category' in data['results'][0]
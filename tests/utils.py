@@ -1,4 +1,6 @@
+import time
 from http import HTTPStatus
+from urllib.parse import parse_qs
 
 
 check_name_and_slug_patterns = (
@@ -305,3 +307,39 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def explain_query_plan(queryset):
+    from django.db import connection
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def measure_get(client, url, **params):
+    """GET-запрос к url с параметрами из строки запроса и params.
+    Возвращает ответ и его стоимость: число SQL-запросов, JOIN в них,
+    размер ответа и время."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    path, _, query = url.partition('?')
+    with CaptureQueriesContext(connection) as context:
+        start = time.perf_counter()
+        response = client.get(path, {**parse_qs(query), **params})
+        elapsed = time.perf_counter() - start
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что GET-запрос к `{url}` с параметрами {params} '
+        'возвращает ответ со статусом 200.'
+    )
+    return response, {
+        'queries': len(context.captured_queries),
+        'joins': sum(
+            query['sql'].count(' JOIN ')
+            for query in context.captured_queries
+        ),
+        'bytes': len(response.content),
+        'time_ms': round(elapsed * 1000, 2),
+    }